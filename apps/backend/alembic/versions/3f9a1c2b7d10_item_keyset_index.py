@@ -0,0 +1,56 @@
+"""Add composite (created_at, id) index on item for keyset pagination
+
+Revision ID: 3f9a1c2b7d10
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c2b7d10"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_item_table() -> bool:
+    # Offline (--sql) there is no database to inspect, so the DDL is emitted
+    # unconditionally for a database that already has the item table
+    if context.is_offline_mode():
+        return True
+    return sa.inspect(op.get_bind()).has_table("item")
+
+
+def _applies() -> bool:
+    # env.py runs every revision against both databases; this one only
+    # concerns app_db, and only once the item table exists (a fresh database
+    # gets the index from the model metadata when the table is created).
+    if op.get_context().version_table != "alembic_version_app":
+        return False
+    return _has_item_table()
+
+
+def upgrade() -> None:
+    if not _applies():
+        return
+    # Build without locking writes on large tables
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_item_created_at_id",
+            "item",
+            ["created_at", "id"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if not _applies():
+        return
+    op.drop_index("ix_item_created_at_id", table_name="item", if_exists=True)
@@ -0,0 +1,89 @@
+"""Add generated search_vector column with GIN index, and trigram index on item.title
+
+Revision ID: 8c41d7e2a9b5
+Revises: 3f9a1c2b7d10
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d7e2a9b5"
+down_revision: Union[str, None] = "3f9a1c2b7d10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+
+def _is_app_db() -> bool:
+    # env.py runs every revision against both databases; this one only concerns app_db
+    return op.get_context().version_table == "alembic_version_app"
+
+
+def _has_item_table() -> bool:
+    # Offline (--sql) there is no database to inspect, so the DDL is emitted
+    # unconditionally for a database that already has the item table
+    if context.is_offline_mode():
+        return True
+    return sa.inspect(op.get_bind()).has_table("item")
+
+
+def _applies() -> bool:
+    # The column and indexes only need adding once the item table exists (a
+    # fresh database gets them from the model metadata when it is created)
+    return _is_app_db() and _has_item_table()
+
+
+def upgrade() -> None:
+    if not _is_app_db():
+        return
+    # Needed even before the item table exists: the model's ix_item_title_trgm
+    # uses gin_trgm_ops, so creating the table from the metadata requires it
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    if not _applies():
+        return
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        "item",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_item_search_vector",
+            "item",
+            ["search_vector"],
+            postgresql_using="gin",
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_item_title_trgm",
+            "item",
+            ["title"],
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if not _applies():
+        return
+    op.drop_index("ix_item_title_trgm", table_name="item", if_exists=True)
+    op.drop_index("ix_item_search_vector", table_name="item", if_exists=True)
+    op.drop_column("item", "search_vector")
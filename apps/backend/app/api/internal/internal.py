@@ -0,0 +1,30 @@
+"""Internal operational endpoints (superuser only)."""
+
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.dependencies.auth import cached_superuser
+from core.cache import cache_stats
+from core.database import pool_statuses
+from core.redis import redis_statuses
+
+router = APIRouter(dependencies=[Depends(cached_superuser)])
+
+
+@router.get("/cache")
+async def get_cache_stats() -> dict[str, int]:
+    """Hit/miss/eviction counters for this process's cache tiers."""
+    return cache_stats()
+
+
+@router.get("/pools")
+async def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Connection pool occupancy and checkout wait/timeout stats for this process."""
+    return pool_statuses()
+
+
+@router.get("/redis")
+async def get_redis_stats() -> dict[str, dict[str, Any]]:
+    """Redis pool occupancy, pool waits and command latency for this process."""
+    return redis_statuses()
@@ -1,25 +1,297 @@
 """Example CRUD endpoint — auto-discovered by the dynamic router loader."""
 
+import csv
+import io
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from datetime import datetime
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import REAL, ColumnElement, Select, and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.item import ItemCreate, ItemRead, ItemUpdate
-from core.database import AppDbSessionDep
-from core.schemas.item import Item
+from app.models.item import (
+    ItemBulkResult,
+    ItemBulkUpdate,
+    ItemCreate,
+    ItemImportSummary,
+    ItemRead,
+    ItemUpdate,
+)
+from core.bulk_load import LoadFormat, load_stream
+from core.cache import ReadThroughCache
+from core.config import settings
+from core.database import (
+    AppDbReadSessionDep,
+    AppDbSessionDep,
+    bulk_delete_returning,
+    bulk_insert_returning,
+    bulk_update_returning,
+    delete_returning,
+    json_array,
+    json_row,
+    update_returning,
+)
+from core.etag import (
+    collection_etag,
+    etag_matches,
+    make_etag,
+    not_modified,
+    parse_versions,
+)
+from core.exceptions import ValidationError
+from core.fields import SparseFields, project_columns
+from core.pagination import after_keyset, decode_cursor, encode_cursor
+from core.replicas import is_replica_session
+from core.responses import rows_response
+from core.schemas.item import ITEM_SEARCH_CONFIG, Item
+from core.write_behind import WriteBehindBuffer
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.get("/", response_model=list[ItemRead])
-async def list_items(session: AppDbSessionDep, limit: int = 20, offset: int = 0) -> list[ItemRead]:
-    result = await session.execute(select(Item).limit(limit).offset(offset))
-    return [ItemRead.model_validate(row) for row in result.scalars().all()]
+BulkBody = Body(min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+item_cache = ReadThroughCache(Item, ItemRead)
+item_write_buffer = WriteBehindBuffer(Item)
+
+NOT_MODIFIED: dict[int | str, dict[str, Any]] = {
+    304: {"description": "Not modified (If-None-Match matched)"}
+}
+
+
+async def _load_item(session: AsyncSession, item_id: uuid.UUID) -> ItemRead | None:
+    item = await session.get(Item, item_id)
+    return ItemRead.model_validate(item) if item else None
+
+
+async def _item_version(session: AsyncSession, item_id: uuid.UUID) -> datetime | None:
+    """Current ``updated_at`` of an item, from the cache or a one-column SELECT."""
+    cached = await item_cache.get(item_id)
+    if cached is not None:
+        return cached.updated_at
+    version: datetime | None = await session.scalar(
+        select(Item.updated_at).where(Item.id == item_id)
+    )
+    return version
+
+
+@router.get("/", response_model=list[ItemRead], responses=NOT_MODIFIED)
+async def list_items(
+    session: AppDbReadSessionDep,
+    if_none_match: str | None = Header(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+    offset: int | None = Query(None, ge=0, deprecated=True),
+    fields: list[str] | None = Depends(SparseFields(ItemRead)),
+) -> Response:
+    """List items ordered by (created_at, id).
+
+    Pages are keyset-paginated: pass the `X-Next-Cursor` response header back
+    as `cursor` to fetch the next page. The header is absent on the last page.
+    `offset` is kept for legacy clients and scans every skipped row.
+
+    `fields=id,title` selects and returns only those columns.
+
+    The page carries a weak `ETag`; a matching `If-None-Match` gets a 304.
+    """
+    order_by = (Item.created_at, Item.id)
+    keys = (Item.id, Item.created_at, Item.updated_at)
+    # Whole entities, projected columns or pre-rendered JSON, depending on the request
+    stmt: Select[Any]
+    if settings.DB_JSON_RENDERING:
+        stmt = select(json_row(Item, fields or list(ItemRead.model_fields)), *keys)
+    elif fields is None:
+        stmt = select(Item)
+    else:
+        stmt = select(*project_columns(Item, fields, *keys))
+    stmt = stmt.order_by(*order_by).limit(limit + 1)
+    if cursor is not None:
+        created_at, item_id = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+        stmt = stmt.where(after_keyset(order_by, (created_at, item_id)))
+    elif offset:
+        stmt = stmt.offset(offset)
+
+    result = await session.execute(stmt)
+    whole_rows = fields is None and not settings.DB_JSON_RENDERING
+    rows: list[Any] = list(result.scalars().all() if whole_rows else result.all())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    etag = collection_etag([(row.id, row.updated_at) for row in rows], has_more, fields)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    headers = {"ETag": etag}
+    if has_more:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    if settings.DB_JSON_RENDERING:
+        body = json_array([row.json for row in rows])
+        return Response(body, media_type="application/json", headers=headers)
+    # Rows are serialized straight from the ORM; see core.responses
+    return rows_response(ItemRead, rows, fields, headers=headers)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+@router.get("/search", response_model=list[ItemRead])
+async def search_items(
+    session: AppDbReadSessionDep,
+    q: str = Query(..., min_length=1, max_length=200),
+    mode: Literal["fulltext", "prefix"] = "fulltext",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="Opaque token from the X-Next-Cursor header"),
+) -> Response:
+    """Search items by title and description.
+
+    - `fulltext` (default): web-search syntax over the generated `search_vector`
+      (GIN index), ranked by `ts_rank` with title matches weighted highest.
+    - `prefix`: case-insensitive title prefix match for autocomplete, served
+      by the trigram index and ordered by title.
+
+    Both modes are keyset-paginated through the `X-Next-Cursor` header.
+    """
+    if mode == "prefix":
+        order_by = (Item.title, Item.id)
+        stmt = (
+            select(Item)
+            .where(Item.title.ilike(f"{_escape_like(q)}%", escape="\\"))
+            .order_by(*order_by)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            stmt = stmt.where(after_keyset(order_by, decode_cursor(cursor, str, uuid.UUID)))
+        items = list((await session.scalars(stmt)).all())
+        keys = [(item.title, item.id) for item in items]
+    else:
+        query = func.websearch_to_tsquery(cast(literal(ITEM_SEARCH_CONFIG), REGCONFIG), q)
+        rank = func.ts_rank(Item.search_vector, query, type_=REAL)
+        stmt = (
+            select(Item, rank)
+            .where(Item.search_vector.op("@@")(query))
+            .order_by(rank.desc(), Item.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            last_rank, last_id = decode_cursor(cursor, float, uuid.UUID)
+            stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, Item.id > last_id)))
+        rows = (await session.execute(stmt)).all()
+        items = [item for item, _ in rows]
+        keys = [(item_rank, item.id) for item, item_rank in rows]
+
+    headers = {}
+    if len(items) > limit:
+        items = items[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(*keys[limit - 1])
+    return rows_response(ItemRead, items, headers=headers)
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+async def _export_chunks(
+    session: AsyncSession,
+    export_format: Literal["ndjson", "csv"],
+    created_from: datetime | None,
+    created_to: datetime | None,
+) -> AsyncIterator[bytes]:
+    stmt = select(Item).order_by(Item.created_at, Item.id)
+    if created_from is not None:
+        stmt = stmt.where(Item.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Item.created_at < created_to)
+    stmt = stmt.execution_options(yield_per=settings.EXPORT_BATCH_ROWS)
+
+    fields = list(ItemRead.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(fields)
+
+    rows = await session.stream_scalars(stmt)
+    async for partition in rows.partitions():
+        for row in partition:
+            item = ItemRead.model_validate(row)
+            if export_format == "csv":
+                writer.writerow(item.model_dump(mode="json").values())
+            else:
+                buffer.write(item.model_dump_json())
+                buffer.write("\n")
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in STREAM_MEDIA_TYPES.values()}}},
+)
+async def export_items(
+    session: AppDbReadSessionDep,
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    created_from: datetime | None = Query(None, description="Inclusive lower bound"),
+    created_to: datetime | None = Query(None, description="Exclusive upper bound"),
+) -> StreamingResponse:
+    """Stream every item (optionally within a created_at range) as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and flushed in chunks of
+    `EXPORT_BATCH_ROWS`, so memory use is constant regardless of table size.
+    """
+    return StreamingResponse(
+        _export_chunks(session, export_format, created_from, created_to),
+        media_type=STREAM_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="items.{export_format}"'},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=ItemImportSummary,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in STREAM_MEDIA_TYPES.values()
+            },
+        }
+    },
+)
+async def import_items(session: AppDbSessionDep, request: Request) -> ItemImportSummary:
+    """Bulk-load items from a streamed NDJSON or CSV request body via Postgres COPY.
+
+    The format follows `Content-Type` (`application/x-ndjson` or `text/csv`
+    with a header row). Rows are validated against `ItemCreate` and committed
+    every `IMPORT_BATCH_ROWS` rows; invalid rows, including rows that are not
+    UTF-8 or exceed `IMPORT_MAX_RECORD_BYTES`, are reported by line number.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt: LoadFormat = "csv" if content_type == STREAM_MEDIA_TYPES["csv"] else "ndjson"
+    progress = await load_stream(
+        session,
+        Item,
+        ItemCreate,
+        request.stream(),
+        fmt,
+        settings.IMPORT_BATCH_ROWS,
+        max_record_bytes=settings.IMPORT_MAX_RECORD_BYTES,
+    )
+    return ItemImportSummary(**asdict(progress))
 
 
 @router.post("/", response_model=ItemRead, status_code=201)
 async def create_item(session: AppDbSessionDep, payload: ItemCreate) -> ItemRead:
+    if settings.ITEMS_WRITE_BEHIND:
+        return ItemRead.model_validate(await item_write_buffer.insert(payload.model_dump()))
     item = Item(title=payload.title, description=payload.description)
     session.add(item)
     await session.commit()
@@ -27,32 +299,124 @@ async def create_item(session: AppDbSessionDep, payload: ItemCreate) -> ItemRead
     return ItemRead.model_validate(item)
 
 
-@router.get("/{item_id}", response_model=ItemRead)
-async def get_item(session: AppDbSessionDep, item_id: uuid.UUID) -> ItemRead:
-    item = await session.get(Item, item_id)
+@router.post("/bulk", response_model=list[ItemBulkResult], status_code=201)
+async def bulk_create_items(
+    session: AppDbSessionDep, payload: Annotated[list[ItemCreate], BulkBody]
+) -> list[ItemBulkResult]:
+    items = await bulk_insert_returning(session, Item, [entry.model_dump() for entry in payload])
+    await session.commit()
+    return [
+        ItemBulkResult(
+            index=index, id=item.id, status="created", item=ItemRead.model_validate(item)
+        )
+        for index, item in enumerate(items)
+    ]
+
+
+@router.patch("/bulk", response_model=list[ItemBulkResult])
+async def bulk_update_items(
+    session: AppDbSessionDep, payload: Annotated[list[ItemBulkUpdate], BulkBody]
+) -> list[ItemBulkResult]:
+    ids = [entry.id for entry in payload]
+    if len(set(ids)) != len(ids):
+        raise ValidationError("Duplicate item ids in bulk update")
+
+    items = await bulk_update_returning(
+        session,
+        Item,
+        [entry.model_dump(exclude_unset=True) | {"id": entry.id} for entry in payload],
+        fields=list(ItemUpdate.model_fields),
+    )
+    await session.commit()
+    await item_cache.invalidate(*ids)
+
+    updated = {item.id: item for item in items}
+    return [
+        ItemBulkResult(
+            index=index, id=item_id, status="updated", item=ItemRead.model_validate(item)
+        )
+        if (item := updated.get(item_id)) is not None
+        else ItemBulkResult(index=index, id=item_id, status="not_found")
+        for index, item_id in enumerate(ids)
+    ]
+
+
+@router.delete("/bulk", response_model=list[ItemBulkResult])
+async def bulk_delete_items(
+    session: AppDbSessionDep, payload: Annotated[list[uuid.UUID], BulkBody]
+) -> list[ItemBulkResult]:
+    deleted = set(await bulk_delete_returning(session, Item, list(dict.fromkeys(payload))))
+    await session.commit()
+    await item_cache.invalidate(*deleted)
+    return [
+        ItemBulkResult(
+            index=index, id=item_id, status="deleted" if item_id in deleted else "not_found"
+        )
+        for index, item_id in enumerate(payload)
+    ]
+
+
+@router.get("/{item_id}", response_model=ItemRead, responses=NOT_MODIFIED)
+async def get_item(
+    session: AppDbReadSessionDep,
+    response: Response,
+    item_id: uuid.UUID,
+    if_none_match: str | None = Header(None),
+) -> ItemRead | Response:
+    if if_none_match is not None:
+        version = await _item_version(session, item_id)
+        if version is not None and etag_matches(if_none_match, make_etag(item_id, version)):
+            return not_modified(make_etag(item_id, version))
+
+    # A replica may still hold the version an invalidation just removed; don't cache it
+    item = await item_cache.get_or_load(
+        item_id, lambda: _load_item(session, item_id), store=not is_replica_session(session)
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    return ItemRead.model_validate(item)
+    response.headers["ETag"] = make_etag(item.id, item.updated_at)
+    return item
 
 
-@router.patch("/{item_id}", response_model=ItemRead)
+@router.patch(
+    "/{item_id}",
+    response_model=ItemRead,
+    responses={412: {"description": "If-Match did not match the current ETag"}},
+)
 async def update_item(
-    session: AppDbSessionDep, item_id: uuid.UUID, payload: ItemUpdate
+    session: AppDbSessionDep,
+    response: Response,
+    item_id: uuid.UUID,
+    payload: ItemUpdate,
+    if_match: str | None = Header(None),
 ) -> ItemRead:
-    item = await session.get(Item, item_id)
+    """Partially update an item.
+
+    Send the item's `ETag` as `If-Match` to make the update conditional: it is
+    applied only if the row is unchanged, otherwise the response is 412.
+    """
+    criteria: list[ColumnElement[bool]] = []
+    if if_match is not None:
+        versions = parse_versions(if_match, item_id)
+        if versions is not None:
+            criteria.append(Item.updated_at.in_(versions))
+
+    changes = payload.model_dump(exclude_unset=True)
+    item = await update_returning(session, Item, item_id, changes, *criteria)
     if not item:
+        if criteria and await _item_version(session, item_id) is not None:
+            raise HTTPException(status_code=412, detail="Item has been modified")
         raise HTTPException(status_code=404, detail="Item not found")
-    for field, value in payload.model_dump(exclude_unset=True).items():
-        setattr(item, field, value)
     await session.commit()
-    await session.refresh(item)
-    return ItemRead.model_validate(item)
+    await item_cache.invalidate(item_id)
+    updated = ItemRead.model_validate(item)
+    response.headers["ETag"] = make_etag(updated.id, updated.updated_at)
+    return updated
 
 
 @router.delete("/{item_id}", status_code=204)
 async def delete_item(session: AppDbSessionDep, item_id: uuid.UUID) -> None:
-    item = await session.get(Item, item_id)
-    if not item:
+    if not await delete_returning(session, Item, item_id):
         raise HTTPException(status_code=404, detail="Item not found")
-    await session.delete(item)
     await session.commit()
+    await item_cache.invalidate(item_id)
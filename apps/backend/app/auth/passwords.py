@@ -0,0 +1,53 @@
+"""Password hashing off the event loop.
+
+argon2 and bcrypt take tens of milliseconds per call by design. fastapi-users
+calls its password helper inline, so ``UserManager`` awaits the ``*_async``
+variants below instead, which run on a ``BoundedExecutor`` (argon2-cffi and
+bcrypt release the GIL, so threads hash in parallel). A login burst beyond
+``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT`` gets a fast 503.
+
+New hashes use argon2id with the configured costs. Existing hashes made
+with other costs (or bcrypt) still verify and are upgraded on the next login.
+"""
+
+from functools import cache
+
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from core.config import settings
+from core.executors import BoundedExecutor
+
+
+class PooledPasswordHelper(PasswordHelper):
+    def __init__(self, password_hash: PasswordHash, executor: BoundedExecutor) -> None:
+        super().__init__(password_hash)
+        self.executor = executor
+
+    async def hash_async(self, password: str) -> str:
+        return await self.executor.run(self.hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        return await self.executor.run(self.verify_and_update, plain_password, hashed_password)
+
+
+@cache
+def get_password_helper() -> PooledPasswordHelper:
+    password_hash = PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=settings.PASSWORD_ARGON2_TIME_COST,
+                memory_cost=settings.PASSWORD_ARGON2_MEMORY_COST,
+                parallelism=settings.PASSWORD_ARGON2_PARALLELISM,
+            ),
+            BcryptHasher(rounds=settings.PASSWORD_BCRYPT_ROUNDS),
+        )
+    )
+    executor = BoundedExecutor(
+        "Password hashing", settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT
+    )
+    return PooledPasswordHelper(password_hash, executor)
@@ -0,0 +1,142 @@
+"""Redis session tokens indexed per user.
+
+fastapi-users' ``RedisStrategy`` stores one ``<prefix><token>`` key per
+session, so finding a user's sessions would take a ``SCAN`` of the whole
+keyspace. ``IndexedRedisStrategy`` also keeps a sorted set per user
+(``auth:sessions:<user id>``) whose members are the user's tokens, scored
+by expiry. Writes and revocations update the token key and the index in one
+``MULTI``, and the index itself expires with the user's newest token.
+
+Members are removed lazily rather than by a sweeper: expired scores are
+trimmed on every write and listing, and a listing also drops members whose
+token key is gone (e.g. evicted, or deleted by an older code path).
+
+Tokens are bearer credentials, so listings identify sessions by
+``session_id()``, a hash of the token, never by the token itself.
+"""
+
+import hashlib
+import math
+import secrets
+import time
+import uuid
+from dataclasses import dataclass
+from typing import cast
+
+from fastapi_users.authentication import RedisStrategy
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from core.exceptions import ServiceUnavailableError
+from core.schemas.users import User
+
+SESSIONS_PREFIX = "auth:sessions:"
+# Optimistic revocation attempts before giving up on a contended index
+MAX_WATCH_RETRIES = 5
+
+
+def session_id(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=12).hexdigest()
+
+
+@dataclass
+class Session:
+    token: str
+    expires_at: float | None
+
+    @property
+    def id(self) -> str:
+        return session_id(self.token)
+
+
+class IndexedRedisStrategy(RedisStrategy[User, uuid.UUID]):
+    def __init__(
+        self,
+        redis: Redis,
+        lifetime_seconds: int | None = None,
+        *,
+        key_prefix: str = "fastapi_users_token:",
+        index_prefix: str = SESSIONS_PREFIX,
+    ) -> None:
+        super().__init__(redis, lifetime_seconds, key_prefix=key_prefix)
+        self.index_prefix = index_prefix
+
+    def index_key(self, user_id: uuid.UUID) -> str:
+        return f"{self.index_prefix}{user_id}"
+
+    async def write_token(self, user: User) -> str:
+        token = secrets.token_urlsafe()
+        index = self.index_key(user.id)
+        now = time.time()
+        expires_at = now + self.lifetime_seconds if self.lifetime_seconds else math.inf
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(f"{self.key_prefix}{token}", str(user.id), ex=self.lifetime_seconds)
+            pipe.zadd(index, {token: expires_at})
+            pipe.zremrangebyscore(index, "-inf", now)
+            if self.lifetime_seconds:
+                # Tokens are written in expiry order, so the index outlives them all
+                pipe.expire(index, self.lifetime_seconds)
+            await pipe.execute()
+        return token
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(f"{self.key_prefix}{token}")
+            pipe.zrem(self.index_key(user.id), token)
+            await pipe.execute()
+
+    async def list_sessions(self, user_id: uuid.UUID) -> list[Session]:
+        """The user's live sessions, soonest expiry first, pruning stale index members."""
+        index = self.index_key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zremrangebyscore(index, "-inf", time.time())
+            pipe.zrange(index, 0, -1, withscores=True)
+            _, members = await pipe.execute()
+        if not members:
+            return []
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for token, _ in members:
+                pipe.exists(f"{self.key_prefix}{token}")
+            alive = await pipe.execute()
+        gone = [token for (token, _), exists in zip(members, alive, strict=True) if not exists]
+        if gone:
+            await self.redis.zrem(index, *gone)
+        return [
+            Session(token, None if math.isinf(score) else score)
+            for (token, score), exists in zip(members, alive, strict=True)
+            if exists
+        ]
+
+    async def revoke_sessions(
+        self, user_id: uuid.UUID, session_ids: set[str] | None = None, keep: str | None = None
+    ) -> int:
+        """Revoke the user's sessions in `session_ids` (all when None), except token `keep`.
+
+        Returns how many index members were removed. The index is watched so
+        a session written concurrently is either revoked or left untouched,
+        never orphaned from the index. Raises ``ServiceUnavailableError`` if
+        the index keeps changing for ``MAX_WATCH_RETRIES`` attempts.
+        """
+        index = self.index_key(user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for _ in range(MAX_WATCH_RETRIES):
+                try:
+                    await pipe.watch(index)
+                    tokens = [
+                        token
+                        for token in cast(list[str], await pipe.zrange(index, 0, -1))
+                        if token != keep
+                        and (session_ids is None or session_id(token) in session_ids)
+                    ]
+                    if not tokens:
+                        await pipe.unwatch()  # type: ignore[no-untyped-call]
+                        return 0
+                    pipe.multi()  # type: ignore[no-untyped-call]
+                    pipe.delete(*(f"{self.key_prefix}{token}" for token in tokens))
+                    pipe.zrem(index, *tokens)
+                    await pipe.execute()
+                    return len(tokens)
+                except WatchError:
+                    continue
+        raise ServiceUnavailableError("Sessions are changing concurrently, try again")
@@ -0,0 +1,272 @@
+"""Stateless signed access tokens with Redis-backed refresh tokens.
+
+Access tokens are ``<claims>.<signature>``: base64url JSON claims (``sub``,
+``exp``, ``jti``) and an HMAC-SHA256 over them with a key derived from
+``settings.SECRET``. They are verified in-process with no I/O, so they are
+short-lived. Long-lived refresh tokens are opaque and stored in Redis under
+a hash of the token; each one can be exchanged once for a new token pair.
+An access token issued with a refresh token carries that hash as ``rid``
+(claims are only signed, not encrypted), so logout can revoke the pair.
+
+Revoked access tokens (logout) are recorded in a Redis sorted set scored
+by expiry. Every process mirrors that set in a ``BloomFilter``, which is
+rebuilt every ``sync_seconds``. Only tokens the filter reports as possibly
+revoked cost a Redis round trip, so a token revoked by another process is
+rejected after at most one sync interval.
+"""
+
+import asyncio
+import base64
+import contextlib
+import hashlib
+import hmac
+import logging
+import math
+import secrets
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any, cast
+
+import orjson
+from fastapi_users import exceptions
+from fastapi_users.authentication import Strategy
+from fastapi_users.manager import BaseUserManager
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from core.schemas.users import User
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY = "auth:revoked"
+REFRESH_PREFIX = "auth:refresh:"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def signing_key(secret: str) -> bytes:
+    # Separate from other uses of the secret (e.g. reset-password tokens)
+    return hashlib.sha256(b"signed-access-token\x00" + secret.encode()).digest()
+
+
+def sign_token(claims: dict[str, Any], key: bytes) -> str:
+    payload = _b64encode(orjson.dumps(claims))
+    signature = hmac.new(key, payload.encode(), hashlib.sha256).digest()
+    return f"{payload}.{_b64encode(signature)}"
+
+
+def verify_token(token: str, key: bytes, now: float | None = None) -> dict[str, Any] | None:
+    """Claims of a correctly signed, unexpired token; None otherwise."""
+    payload, _, signature = token.partition(".")
+    if not signature:
+        return None
+    expected = hmac.new(key, payload.encode(), hashlib.sha256).digest()
+    try:
+        if not hmac.compare_digest(_b64decode(signature), expected):
+            return None
+        claims = orjson.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if not isinstance(claims, dict) or claims.get("exp", 0) <= (now or time.time()):
+        return None
+    return claims
+
+
+# ---------------------------------------------------------------------------
+# Revocation
+# ---------------------------------------------------------------------------
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false-positive rate."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class RevocationFilter:
+    """In-process view of revoked access-token ids, synced from Redis.
+
+    Started and stopped from the application lifespan.
+    """
+
+    def __init__(
+        self,
+        redis: Callable[[], Redis],
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_seconds: float = 5.0,
+    ) -> None:
+        self.redis = redis
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._filter = BloomFilter(capacity, error_rate)
+        # Unexpired revocations made by this process, so a rebuild racing a
+        # revoke() cannot drop them
+        self._recent: dict[str, float] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    async def revoke(self, jti: str, expires_at: float) -> None:
+        self._filter.add(jti)
+        self._recent[jti] = expires_at
+        await self.redis().zadd(REVOKED_KEY, {jti: expires_at})
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self._filter:
+            return False
+        try:
+            return await self.redis().zscore(REVOKED_KEY, jti) is not None
+        except RedisError:
+            # Fail closed: the filter says this token may be revoked
+            logger.warning("Token revocation check failed", exc_info=True)
+            return True
+
+    async def sync(self) -> None:
+        now = time.time()
+        async with self.redis().pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(REVOKED_KEY, "-inf", now)
+            pipe.zrange(REVOKED_KEY, 0, -1)
+            _, revoked = await pipe.execute()
+        rebuilt = BloomFilter(self.capacity, self.error_rate)
+        for jti in revoked:
+            rebuilt.add(jti)
+        self._recent = {jti: exp for jti, exp in self._recent.items() if exp > now}
+        for jti in self._recent:
+            rebuilt.add(jti)
+        self._filter = rebuilt
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                # Any failure must not end the task: the filter would stop
+                # learning about revocations made by other processes
+                logger.warning("Token revocation sync failed; retrying", exc_info=True)
+            await asyncio.sleep(self.sync_seconds)
+
+
+# ---------------------------------------------------------------------------
+# Refresh tokens
+# ---------------------------------------------------------------------------
+
+
+def refresh_token_id(token: str) -> str:
+    return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+
+class RefreshTokenStore:
+    def __init__(self, redis: Redis, lifetime_seconds: int) -> None:
+        self.redis = redis
+        self.lifetime_seconds = lifetime_seconds
+
+    async def issue(self, user_id: uuid.UUID) -> str:
+        token = secrets.token_urlsafe(32)
+        await self.redis.set(
+            f"{REFRESH_PREFIX}{refresh_token_id(token)}", str(user_id), ex=self.lifetime_seconds
+        )
+        return token
+
+    async def consume(self, token: str) -> uuid.UUID | None:
+        """The token's user id, deleting the token so it cannot be replayed."""
+        user_id = await self.redis.getdel(f"{REFRESH_PREFIX}{refresh_token_id(token)}")
+        # Built with get_text_redis(), which decodes responses
+        return uuid.UUID(cast(str, user_id)) if user_id is not None else None
+
+    async def revoke(self, token: str, user_id: uuid.UUID) -> bool:
+        """Delete `token` if it belongs to `user_id`; False if it belongs to another user."""
+        key = f"{REFRESH_PREFIX}{refresh_token_id(token)}"
+        owner = await self.redis.get(key)
+        if owner is None:
+            return True
+        if owner != str(user_id):
+            return False
+        await self.redis.delete(key)
+        return True
+
+    async def revoke_id(self, token_id: str) -> None:
+        """Delete the refresh token named by an access token's ``rid`` claim."""
+        await self.redis.delete(f"{REFRESH_PREFIX}{token_id}")
+
+
+# ---------------------------------------------------------------------------
+# fastapi-users strategy
+# ---------------------------------------------------------------------------
+
+
+class SignedTokenStrategy(Strategy[User, uuid.UUID]):
+    def __init__(self, secret: str, lifetime_seconds: int, revocations: RevocationFilter) -> None:
+        self.key = signing_key(secret)
+        self.lifetime_seconds = lifetime_seconds
+        self.revocations = revocations
+
+    def issue(self, user_id: uuid.UUID, refresh_token: str | None = None) -> str:
+        claims = {
+            "sub": str(user_id),
+            "exp": int(time.time()) + self.lifetime_seconds,
+            "jti": secrets.token_urlsafe(12),
+        }
+        if refresh_token is not None:
+            claims["rid"] = refresh_token_id(refresh_token)
+        return sign_token(claims, self.key)
+
+    async def verify(self, token: str) -> dict[str, Any] | None:
+        claims = verify_token(token, self.key)
+        if claims is None or await self.revocations.is_revoked(claims["jti"]):
+            return None
+        return claims
+
+    async def read_token(
+        self, token: str | None, user_manager: BaseUserManager[User, uuid.UUID]
+    ) -> User | None:
+        if token is None:
+            return None
+        claims = await self.verify(token)
+        if claims is None:
+            return None
+        try:
+            return await user_manager.get(user_manager.parse_id(claims["sub"]))
+        except (exceptions.UserNotExists, exceptions.InvalidID):
+            return None
+
+    async def write_token(self, user: User) -> str:
+        return self.issue(user.id)
+
+    async def destroy_token(self, token: str, user: User) -> None:
+        claims = verify_token(token, self.key)
+        if claims is not None:
+            await self.revocations.revoke(claims["jti"], claims["exp"])
@@ -1,11 +1,17 @@
 import logging
 import uuid
 from functools import cache
+from typing import Any
 
+import jwt
 from fastapi import Request
-from fastapi_users import BaseUserManager, UUIDIDMixin
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager, UUIDIDMixin, exceptions, schemas
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from httpx_oauth.clients.google import GoogleOAuth2
 
+from app.auth.passwords import PooledPasswordHelper, get_password_helper
 from core.config import settings
 from core.schemas.users import User
 
@@ -24,6 +30,112 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     reset_password_token_secret = settings.SECRET
     verification_token_secret = settings.SECRET
 
+    password_helper: PooledPasswordHelper
+
+    def __init__(
+        self,
+        user_db: BaseUserDatabase[User, uuid.UUID],
+        password_helper: PooledPasswordHelper | None = None,
+    ) -> None:
+        super().__init__(user_db, password_helper or get_password_helper())
+
+    # -----------------------------------------------------------------------
+    # Password hashing off the event loop (see app.auth.passwords). These
+    # mirror BaseUserManager, awaiting the pooled helper instead of calling
+    # it inline.
+    # -----------------------------------------------------------------------
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> User | None:
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            await self.password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_password_hash = await self.password_helper.verify_and_update_async(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def create(
+        self,
+        user_create: schemas.BaseUserCreate,
+        safe: bool = False,
+        request: Request | None = None,
+    ) -> User:
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise exceptions.UserAlreadyExists()
+
+        # fastapi-users leaves these helpers unannotated
+        user_dict = (
+            user_create.create_update_dict()  # type: ignore[no-untyped-call]
+            if safe
+            else user_create.create_update_dict_superuser()  # type: ignore[no-untyped-call]
+        )
+        password = user_dict.pop("password")
+        user_dict["hashed_password"] = await self.password_helper.hash_async(password)
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+        return created_user
+
+    async def forgot_password(self, user: User, request: Request | None = None) -> None:
+        if not user.is_active:
+            raise exceptions.UserInactive()
+        token_data = {
+            "sub": str(user.id),
+            "password_fgpt": await self.password_helper.hash_async(user.hashed_password),
+            "aud": self.reset_password_token_audience,
+        }
+        token = generate_jwt(
+            token_data,
+            self.reset_password_token_secret,
+            self.reset_password_token_lifetime_seconds,
+        )
+        await self.on_after_forgot_password(user, token, request)
+
+    async def reset_password(
+        self, token: str, password: str, request: Request | None = None
+    ) -> User:
+        try:
+            data = decode_jwt(
+                token, self.reset_password_token_secret, [self.reset_password_token_audience]
+            )
+            user_id, password_fingerprint = data["sub"], data["password_fgpt"]
+            parsed_id = self.parse_id(user_id)
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            raise exceptions.InvalidResetPasswordToken() from None
+
+        user = await self.get(parsed_id)
+        valid_fingerprint, _ = await self.password_helper.verify_and_update_async(
+            user.hashed_password, password_fingerprint
+        )
+        if not valid_fingerprint:
+            raise exceptions.InvalidResetPasswordToken()
+        if not user.is_active:
+            raise exceptions.UserInactive()
+
+        updated_user = await self._update(user, {"password": password})
+        await self.on_after_reset_password(user, request)
+        return updated_user
+
+    async def _update(self, user: User, update_dict: dict[str, Any]) -> User:
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {k: v for k, v in update_dict.items() if k != "password"}
+            update_dict["hashed_password"] = await self.password_helper.hash_async(password)
+        return await super()._update(user, update_dict)
+
+    # -----------------------------------------------------------------------
+    # Hooks
+    # -----------------------------------------------------------------------
+
     async def on_after_register(self, user: User, request: Request | None = None) -> None:
         logger.info("User %s has registered.", user.id)
 
@@ -36,3 +148,22 @@ async def on_after_request_verify(
         self, user: User, token: str, request: Request | None = None
     ) -> None:
         logger.info("Verification requested for user %s. Token: %s", user.id, token)
+
+    # Cached current-user entries (see app.dependencies.auth) go stale on these
+    async def on_after_update(
+        self, user: User, update_dict: dict[str, Any], request: Request | None = None
+    ) -> None:
+        await self._invalidate_cached_user(user)
+
+    async def on_after_verify(self, user: User, request: Request | None = None) -> None:
+        await self._invalidate_cached_user(user)
+
+    async def on_after_delete(self, user: User, request: Request | None = None) -> None:
+        await self._invalidate_cached_user(user)
+
+    @staticmethod
+    async def _invalidate_cached_user(user: User) -> None:
+        # Import here to avoid circular imports
+        from app.dependencies.auth import invalidate_cached_user
+
+        await invalidate_cached_user(user.id)
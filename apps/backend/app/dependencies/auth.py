@@ -1,22 +1,28 @@
 import uuid
-from collections.abc import AsyncGenerator
-from typing import Any
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from functools import cache
+from typing import Any, cast
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     CookieTransport,
-    RedisStrategy,
 )
 from fastapi_users.db import SQLAlchemyUserDatabase
-from redis.asyncio import Redis
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload
 
+from app.auth.sessions import IndexedRedisStrategy
+from app.auth.signed_tokens import RefreshTokenStore, RevocationFilter, SignedTokenStrategy
 from app.auth.user_manager import UserManager
+from app.models.user import CurrentUser, UserFlags
+from core.cache import ReadThroughCache
 from core.config import settings
-from core.database import get_users_db_session
+from core.database import UsersDbSessionDep, get_users_db_session
+from core.redis import get_text_redis
 from core.schemas.users import OAuthAccount, User
 
 # ---------------------------------------------------------------------------
@@ -59,14 +65,37 @@ async def get_user_manager(
 )
 
 # ---------------------------------------------------------------------------
-# Strategy (Redis-backed sessions)
+# Strategy (Redis-backed sessions, indexed per user for listing and bulk logout)
 # ---------------------------------------------------------------------------
 
-redis_instance = Redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+def get_redis_strategy() -> IndexedRedisStrategy:
+    return IndexedRedisStrategy(get_text_redis(), lifetime_seconds=TOKEN_LIFETIME)
 
-def get_redis_strategy() -> RedisStrategy:  # type: ignore[type-arg]
-    return RedisStrategy(redis_instance, lifetime_seconds=TOKEN_LIFETIME)
+
+# ---------------------------------------------------------------------------
+# Strategy (signed access tokens + Redis refresh tokens)
+# ---------------------------------------------------------------------------
+
+
+@cache
+def get_revocation_filter() -> RevocationFilter:
+    return RevocationFilter(
+        get_text_redis,
+        capacity=settings.TOKEN_REVOCATION_FILTER_CAPACITY,
+        error_rate=settings.TOKEN_REVOCATION_FILTER_ERROR_RATE,
+        sync_seconds=settings.TOKEN_REVOCATION_SYNC_SECONDS,
+    )
+
+
+def get_signed_token_strategy() -> SignedTokenStrategy:
+    return SignedTokenStrategy(
+        settings.SECRET, settings.SIGNED_TOKEN_LIFETIME_SECONDS, get_revocation_filter()
+    )
+
+
+def get_refresh_token_store() -> RefreshTokenStore:
+    return RefreshTokenStore(get_text_redis(), settings.REFRESH_TOKEN_LIFETIME_SECONDS)
 
 
 # ---------------------------------------------------------------------------
@@ -85,16 +114,119 @@ def get_redis_strategy() -> RedisStrategy:  # type: ignore[type-arg]
     get_strategy=get_redis_strategy,
 )
 
+signed_auth_backend = AuthenticationBackend(
+    name="signed_bearer",
+    transport=bearer_transport,
+    get_strategy=get_signed_token_strategy,
+)
+
 # ---------------------------------------------------------------------------
 # FastAPIUsers instance
 # ---------------------------------------------------------------------------
 
 fastapi_users = FastAPIUsers[User, uuid.UUID](
     get_user_manager,
-    [redis_auth_backend, cookie_auth_backend],
+    [signed_auth_backend, redis_auth_backend, cookie_auth_backend],
 )
 
-# Dependency shortcuts
+# ---------------------------------------------------------------------------
+# Cached current-user resolution
+# ---------------------------------------------------------------------------
+
+# fastapi_users.current_user() loads the User with its joined oauth_accounts
+# and profile on every request. These dependencies verify signed tokens
+# in-process and look session tokens up in Redis (so logout is immediate),
+# then resolve the user from the read-through cache. UserManager hooks
+# invalidate both entries on update, verify and delete.
+current_user_cache = ReadThroughCache(User, CurrentUser)
+user_flags_cache = ReadThroughCache(User, UserFlags, namespace="user_flags")
+
+
+async def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    await current_user_cache.invalidate(user_id)
+    await user_flags_cache.invalidate(user_id)
+
+
+async def _token_user_id(
+    bearer_token: str | None = Depends(bearer_transport.scheme),
+    cookie_token: str | None = Depends(cookie_transport.scheme),
+) -> uuid.UUID | None:
+    if bearer_token is not None:
+        claims = await get_signed_token_strategy().verify(bearer_token)
+        if claims is not None:
+            return uuid.UUID(claims["sub"])
+    strategy = get_redis_strategy()
+    for token in (bearer_token, cookie_token):
+        if token is None:
+            continue
+        user_id = await strategy.redis.get(f"{strategy.key_prefix}{token}")
+        if user_id is not None:
+            try:
+                # get_text_redis() decodes responses
+                return uuid.UUID(cast(str, user_id))
+            except ValueError:
+                return None
+    return None
+
+
+async def _load_current_user(session: AsyncSession, user_id: uuid.UUID) -> CurrentUser | None:
+    user = await session.scalar(
+        select(User).options(noload(User.oauth_accounts)).where(User.__table__.c.id == user_id)
+    )
+    return CurrentUser.model_validate(user) if user is not None else None
+
+
+async def _load_user_flags(session: AsyncSession, user_id: uuid.UUID) -> UserFlags | None:
+    columns = User.__table__.c
+    row = (
+        await session.execute(
+            select(columns.id, columns.is_active, columns.is_superuser, columns.is_verified).where(
+                columns.id == user_id
+            )
+        )
+    ).first()
+    return UserFlags.model_validate(row) if row is not None else None
+
+
+def cached_current_user(
+    active: bool = False,
+    verified: bool = False,
+    superuser: bool = False,
+    flags_only: bool = False,
+) -> Callable[..., Awaitable[Any]]:
+    """Like ``fastapi_users.current_user()``, returning a cached schema instead of the ORM user.
+
+    The dependency yields a ``CurrentUser`` (flags, email and profile) or,
+    with `flags_only`, a ``UserFlags`` loaded from the user table alone.
+    Status codes match fastapi-users: 401 without a valid token or for an
+    inactive user when `active`, 403 when `verified` or `superuser` fails.
+    """
+    cache: ReadThroughCache[Any] = user_flags_cache if flags_only else current_user_cache
+    loader = _load_user_flags if flags_only else _load_current_user
+
+    async def dependency(
+        session: UsersDbSessionDep,
+        user_id: uuid.UUID | None = Depends(_token_user_id),
+    ) -> UserFlags:
+        user: UserFlags | None = None
+        if user_id is not None:
+            user = await cache.get_or_load(user_id, lambda: loader(session, user_id))
+        if user is None or (active and not user.is_active):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        if (verified and not user.is_verified) or (superuser and not user.is_superuser):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+        return user
+
+    return dependency
+
+
+# Dependency shortcuts (the ORM User, loaded by fastapi-users on every request)
 current_user = fastapi_users.current_user()
 current_active_verified_user = fastapi_users.current_user(active=True, verified=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
+
+# Cached shortcuts (CurrentUser / UserFlags schemas; use where no ORM attributes are needed)
+cached_user = cached_current_user()
+cached_active_user = cached_current_user(active=True, flags_only=True)
+cached_active_verified_user = cached_current_user(active=True, verified=True)
+cached_superuser = cached_current_user(active=True, superuser=True, flags_only=True)
@@ -2,16 +2,26 @@
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-import redis.asyncio as aioredis
 from fastapi import FastAPI, Response
+from fastapi.datastructures import Default
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 
+from app.auth.passwords import get_password_helper
+from app.dependencies.auth import get_revocation_filter
 from app.routers.fastapi_users_endpoints import add_fastapi_endpoints
 from app.routers.service_endpoints import add_service_endpoints
+from core.cache import CacheInvalidationSubscriber
+from core.compression import CompressionMiddleware
 from core.config import settings
-from core.database import get_app_db_engine, get_users_db_engine
+from core.content_negotiation import MessagePackMiddleware, document_msgpack
+from core.database import get_app_db_engine, get_app_db_replicas, get_users_db_engine
 from core.logging import setup_logging
+from core.query_stats import QueryStatsMiddleware
+from core.redis import close_redis, get_redis
+from core.replicas import ReadYourWritesMiddleware
+from core.responses import ORJSONResponse
+from core.write_behind import flush_write_behind_buffers
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +37,24 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     worker = ExampleWorker()
     await worker.start()
 
+    cache_subscriber = CacheInvalidationSubscriber()
+    await cache_subscriber.start()
+
+    revocations = get_revocation_filter()
+    await revocations.start()
+
     yield
 
     # Shutdown
+    await flush_write_behind_buffers()
+    await revocations.stop()
+    get_password_helper().executor.shutdown()
+    await cache_subscriber.stop()
     await worker.stop()
     await get_app_db_engine().dispose()
+    await get_app_db_replicas().dispose()
     await get_users_db_engine().dispose()
+    await close_redis()
     logger.info("Shutdown complete")
 
 
@@ -40,6 +62,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     title=settings.APP_NAME,
     version="0.1.0",
     lifespan=lifespan,
+    # Wrapped in Default() so routes with a response_model keep Pydantic's
+    # direct-to-bytes serialization; orjson renders everything else.
+    default_response_class=Default(ORJSONResponse),
     docs_url="/docs" if settings.IS_LOCAL else None,
     redoc_url="/redoc" if settings.IS_LOCAL else None,
 )
@@ -55,13 +80,47 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
+)
+
+# Read-your-writes stickiness for replica reads
+if settings.APP_DB_REPLICA_URLS:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window_seconds=settings.APP_DB_READ_YOUR_WRITES_SECONDS
+    )
+
+# Per-request SQL counts/timings and N+1 warnings
+app.add_middleware(
+    QueryStatsMiddleware,
+    server_timing=settings.IS_LOCAL,
+    n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
 )
 
 # Auth routes (fastapi-users)
 add_fastapi_endpoints(app)
 
 # Dynamic API routes
-add_service_endpoints(app)
+service_prefixes = add_service_endpoints(app)
+
+# MessagePack negotiation on service routes (inside compression, which must see the final body)
+if settings.MSGPACK_ENABLED:
+    app.add_middleware(
+        MessagePackMiddleware,
+        path_prefixes=service_prefixes,
+        max_body_size=settings.MSGPACK_MAX_BODY_SIZE,
+    )
+    document_msgpack(app, service_prefixes)
+
+# Compression
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        encodings=[e.strip() for e in settings.COMPRESSION_ENCODINGS.split(",") if e.strip()],
+        media_types=[m.strip() for m in settings.COMPRESSION_MEDIA_TYPES.split(",") if m.strip()],
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -93,9 +152,7 @@ async def health() -> Response:
 
     # Check Redis
     try:
-        r = aioredis.from_url(settings.REDIS_URL)
-        await r.ping()
-        await r.aclose()
+        await get_redis().ping()
         checks["redis"] = "ok"
     except Exception:
         checks["redis"] = "error"
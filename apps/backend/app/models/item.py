@@ -1,5 +1,6 @@
 import uuid
 from datetime import datetime
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
@@ -22,3 +23,24 @@ class ItemRead(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class ItemBulkUpdate(ItemUpdate):
+    id: uuid.UUID
+
+
+class ItemBulkResult(BaseModel):
+    """Outcome of one entry of a bulk request, reported at its input position."""
+
+    index: int
+    id: uuid.UUID
+    status: Literal["created", "updated", "deleted", "not_found"]
+    item: ItemRead | None = None
+
+
+class ItemImportSummary(BaseModel):
+    rows_read: int
+    rows_loaded: int
+    rows_rejected: int
+    batches: int
+    errors: list[dict[str, Any]]
@@ -1,5 +1,5 @@
 import uuid
-from datetime import date
+from datetime import date, datetime
 
 from fastapi_users import schemas
 from pydantic import BaseModel
@@ -26,3 +26,36 @@ class UserProfileRead(BaseModel):
     intended_use: str | None = None
 
     model_config = {"from_attributes": True}
+
+
+class UserFlags(BaseModel):
+    """What authorization checks need; cached per user by the auth dependencies."""
+
+    id: uuid.UUID
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
+
+    model_config = {"from_attributes": True}
+
+
+class CurrentUser(UserFlags):
+    email: str
+    profile: UserProfileRead | None = None
+
+
+class SignedTokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
+
+class SessionRead(BaseModel):
+    id: str
+    expires_at: datetime | None
+    current: bool
@@ -10,9 +10,11 @@
 logger = logging.getLogger(__name__)
 
 
-def add_endpoints(app: FastAPI, base_module: types.ModuleType) -> None:
+def add_endpoints(app: FastAPI, base_module: types.ModuleType) -> list[str]:
     """Recursively discover and register APIRouter instances from the api directory.
 
+    Returns the URL prefixes of the registered routers.
+
     Convention:
     - Each .py file in app/api/ must export a `router = APIRouter()` to be discovered.
     - URL prefix is derived from the file's path relative to the base module.
@@ -22,6 +24,7 @@ def add_endpoints(app: FastAPI, base_module: types.ModuleType) -> None:
     """
     base_dir = os.path.dirname(base_module.__file__)  # type: ignore[arg-type]
     base_module_name = base_module.__name__
+    prefixes: list[str] = []
 
     for root, _, files in os.walk(base_dir):
         for file in files:
@@ -69,9 +72,12 @@ def add_endpoints(app: FastAPI, base_module: types.ModuleType) -> None:
 
             # Register
             app.include_router(module.router, prefix=dynamic_prefix, tags=router_tags)
+            prefixes.append(dynamic_prefix)
             logger.info(
                 "Registered router: %s -> prefix=%s tags=%s",
                 module_path,
                 dynamic_prefix,
                 router_tags,
             )
+
+    return prefixes
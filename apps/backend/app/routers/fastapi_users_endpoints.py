@@ -7,6 +7,8 @@
     redis_auth_backend,
 )
 from app.models.user import UserRead, UserUpdate
+from app.routers.session_endpoints import get_session_router
+from app.routers.signed_token_endpoints import get_signed_token_router
 from core.config import settings
 
 
@@ -67,6 +69,20 @@ def add_fastapi_endpoints(app: FastAPI) -> None:
         tags=["users"],
     )
 
+    # Signed access + refresh tokens (verified without a Redis round trip)
+    app.include_router(
+        get_signed_token_router(),
+        prefix="/users/signed-token",
+        tags=["users"],
+    )
+
+    # Session listing and bulk logout (redis_bearer / redis_cookie)
+    app.include_router(
+        get_session_router(),
+        prefix="/users/sessions",
+        tags=["users"],
+    )
+
     # User management
     app.include_router(
         fastapi_users.get_users_router(UserRead, UserUpdate),
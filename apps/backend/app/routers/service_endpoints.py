@@ -4,6 +4,9 @@
 from app.routers.dynamic_endpoints import add_endpoints
 
 
-def add_service_endpoints(app: FastAPI) -> None:
-    """Discover and register all API endpoints from the app.api package."""
-    add_endpoints(app, api)
+def add_service_endpoints(app: FastAPI) -> list[str]:
+    """Discover and register all API endpoints from the app.api package.
+
+    Returns the URL prefixes of the registered routers.
+    """
+    return add_endpoints(app, api)
@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, status
+
+from app.auth.sessions import IndexedRedisStrategy
+from app.dependencies.auth import (
+    bearer_transport,
+    cached_active_user,
+    cookie_transport,
+    get_redis_strategy,
+)
+from app.models.user import SessionRead, UserFlags
+from core.exceptions import NotFoundError
+
+
+async def _request_token(
+    bearer_token: Annotated[str | None, Depends(bearer_transport.scheme)],
+    cookie_token: Annotated[str | None, Depends(cookie_transport.scheme)],
+) -> str | None:
+    return bearer_token or cookie_token
+
+
+def get_session_router() -> APIRouter:
+    """List and revoke the caller's ``redis_bearer`` / ``redis_cookie`` sessions.
+
+    Sessions are identified by a hash of their token. Signed access tokens
+    are not sessions; they expire on their own.
+    """
+    router = APIRouter()
+
+    @router.get("", response_model=list[SessionRead])
+    async def list_sessions(
+        user: Annotated[UserFlags, Depends(cached_active_user)],
+        token: Annotated[str | None, Depends(_request_token)],
+        strategy: Annotated[IndexedRedisStrategy, Depends(get_redis_strategy)],
+    ) -> list[SessionRead]:
+        return [
+            SessionRead(
+                id=session.id,
+                expires_at=(
+                    datetime.fromtimestamp(session.expires_at, UTC)
+                    if session.expires_at is not None
+                    else None
+                ),
+                current=session.token == token,
+            )
+            for session in await strategy.list_sessions(user.id)
+        ]
+
+    @router.delete("", status_code=status.HTTP_204_NO_CONTENT)
+    async def revoke_sessions(
+        user: Annotated[UserFlags, Depends(cached_active_user)],
+        token: Annotated[str | None, Depends(_request_token)],
+        strategy: Annotated[IndexedRedisStrategy, Depends(get_redis_strategy)],
+        include_current: bool = False,
+    ) -> None:
+        """Log out everywhere; the calling session survives unless `include_current`."""
+        await strategy.revoke_sessions(user.id, keep=None if include_current else token)
+
+    @router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+    async def revoke_session(
+        session_id: str,
+        user: Annotated[UserFlags, Depends(cached_active_user)],
+        strategy: Annotated[IndexedRedisStrategy, Depends(get_redis_strategy)],
+    ) -> None:
+        if not await strategy.revoke_sessions(user.id, session_ids={session_id}):
+            raise NotFoundError("Session not found")
+
+    return router
@@ -0,0 +1,95 @@
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import exceptions
+from fastapi_users.router.common import ErrorCode
+
+from app.auth.signed_tokens import RefreshTokenStore, SignedTokenStrategy
+from app.auth.user_manager import UserManager
+from app.dependencies.auth import (
+    bearer_transport,
+    get_refresh_token_store,
+    get_signed_token_strategy,
+    get_user_manager,
+)
+from app.models.user import RefreshTokenRequest, SignedTokenPair
+from core.schemas.users import User
+
+
+async def _issue_pair(
+    user: User, strategy: SignedTokenStrategy, refresh_tokens: RefreshTokenStore
+) -> SignedTokenPair:
+    refresh_token = await refresh_tokens.issue(user.id)
+    return SignedTokenPair(
+        access_token=strategy.issue(user.id, refresh_token),
+        refresh_token=refresh_token,
+        expires_in=strategy.lifetime_seconds,
+    )
+
+
+def get_signed_token_router() -> APIRouter:
+    """Login, refresh and logout for the ``signed_bearer`` backend.
+
+    Login returns a short-lived signed access token plus a refresh token.
+    Each refresh token is single use: exchanging it returns a new pair.
+    Logout revokes the access token and the refresh token issued with it.
+    """
+    router = APIRouter()
+
+    @router.post("/login", response_model=SignedTokenPair)
+    async def login(
+        request: Request,
+        credentials: Annotated[OAuth2PasswordRequestForm, Depends()],
+        user_manager: Annotated[UserManager, Depends(get_user_manager)],
+        strategy: Annotated[SignedTokenStrategy, Depends(get_signed_token_strategy)],
+        refresh_tokens: Annotated[RefreshTokenStore, Depends(get_refresh_token_store)],
+    ) -> SignedTokenPair:
+        user = await user_manager.authenticate(credentials)
+        if user is None or not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=ErrorCode.LOGIN_BAD_CREDENTIALS
+            )
+        pair = await _issue_pair(user, strategy, refresh_tokens)
+        await user_manager.on_after_login(user, request)
+        return pair
+
+    @router.post("/refresh", response_model=SignedTokenPair)
+    async def refresh(
+        payload: RefreshTokenRequest,
+        user_manager: Annotated[UserManager, Depends(get_user_manager)],
+        strategy: Annotated[SignedTokenStrategy, Depends(get_signed_token_strategy)],
+        refresh_tokens: Annotated[RefreshTokenStore, Depends(get_refresh_token_store)],
+    ) -> SignedTokenPair:
+        user_id = await refresh_tokens.consume(payload.refresh_token)
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        try:
+            user = await user_manager.get(user_id)
+        except exceptions.UserNotExists:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED) from None
+        if not user.is_active:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return await _issue_pair(user, strategy, refresh_tokens)
+
+    @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+    async def logout(
+        access_token: Annotated[str | None, Depends(bearer_transport.scheme)],
+        strategy: Annotated[SignedTokenStrategy, Depends(get_signed_token_strategy)],
+        refresh_tokens: Annotated[RefreshTokenStore, Depends(get_refresh_token_store)],
+        payload: Annotated[RefreshTokenRequest | None, Body()] = None,
+    ) -> None:
+        claims = await strategy.verify(access_token) if access_token else None
+        if claims is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        # A refresh token in the body (e.g. one from a later refresh) must be the caller's
+        if payload is not None and not await refresh_tokens.revoke(
+            payload.refresh_token, uuid.UUID(claims["sub"])
+        ):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN)
+        await strategy.revocations.revoke(claims["jti"], claims["exp"])
+        if "rid" in claims:
+            await refresh_tokens.revoke_id(claims["rid"])
+
+    return router
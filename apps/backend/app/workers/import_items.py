@@ -0,0 +1,71 @@
+"""Standalone bulk importer — loads an NDJSON or CSV file of items via Postgres COPY.
+
+Usage:
+    python -m app.workers.import_items items.ndjson
+    python -m app.workers.import_items items.csv --format csv --batch-size 10000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.models.item import ItemCreate
+from core.bulk_load import LoadFormat, LoadProgress, load_stream
+from core.config import settings
+from core.database import get_app_db_engine, get_app_db_session_maker
+from core.logging import setup_logging
+from core.schemas.item import Item
+
+READ_CHUNK_BYTES = 1 << 20
+
+
+async def read_chunks(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := await asyncio.to_thread(f.read, READ_CHUNK_BYTES):
+            yield chunk
+
+
+async def main(path: Path, fmt: LoadFormat, batch_size: int) -> None:
+    setup_logging()
+    print(f"Importing {path} ({fmt}, batch size {batch_size})...")
+    started = time.monotonic()
+
+    def report(progress: LoadProgress) -> None:
+        rate = progress.rows_loaded / max(time.monotonic() - started, 1e-9)
+        print(
+            f"  batch {progress.batches}: {progress.rows_loaded} loaded, "
+            f"{progress.rows_rejected} rejected ({rate:,.0f} rows/s)"
+        )
+
+    session_maker = get_app_db_session_maker()
+    async with session_maker() as session:
+        progress = await load_stream(
+            session,
+            Item,
+            ItemCreate,
+            read_chunks(path),
+            fmt,
+            batch_size,
+            on_progress=report,
+            max_record_bytes=settings.IMPORT_MAX_RECORD_BYTES,
+        )
+    await get_app_db_engine().dispose()
+
+    print(
+        f"\nDone in {time.monotonic() - started:.1f}s: {progress.rows_read} read, "
+        f"{progress.rows_loaded} loaded, {progress.rows_rejected} rejected."
+    )
+    for error in progress.errors:
+        print(f"  line {error['line']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None)
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_ROWS)
+    args = parser.parse_args()
+    fmt: LoadFormat = args.format or ("csv" if args.path.suffix == ".csv" else "ndjson")
+    asyncio.run(main(args.path, fmt, args.batch_size))
@@ -0,0 +1,68 @@
+"""Per-request token validation cost of the three auth backends.
+
+Run from ``apps/backend`` against Redis::
+
+    uv run python -m benchmarks.auth_backends --requests 5000
+
+Each iteration resolves a token to a user id the way the ``cached_*`` user
+dependencies do: ``redis_bearer`` and ``redis_cookie`` look the session
+token up in Redis, while ``signed_bearer`` checks an HMAC signature and the
+in-process revocation filter. User resolution itself is cached and the same
+for every backend, so it is left out.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from app.dependencies.auth import (
+    _token_user_id,
+    get_redis_strategy,
+    get_revocation_filter,
+    get_signed_token_strategy,
+)
+from core.schemas.users import User
+
+
+async def measure(requests: int, resolve: Callable[[], Awaitable[uuid.UUID | None]]) -> list[float]:
+    assert await resolve() is not None
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await resolve()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    user = User(id=uuid.uuid4(), email="bench@example.com", hashed_password="x")
+    session_token = await get_redis_strategy().write_token(user)
+    signed_token = get_signed_token_strategy().issue(user.id)
+    await get_revocation_filter().sync()
+
+    backends = {
+        "redis_bearer": lambda: _token_user_id(bearer_token=session_token, cookie_token=None),
+        "redis_cookie": lambda: _token_user_id(bearer_token=None, cookie_token=session_token),
+        "signed_bearer": lambda: _token_user_id(bearer_token=signed_token, cookie_token=None),
+    }
+    print(f"{args.requests} token validations per backend")
+    try:
+        for name, resolve in backends.items():
+            samples = await measure(args.requests, resolve)
+            print(
+                f"  {name:<14} median {statistics.median(samples) * 1e6:8.1f} us  "
+                f"p95 {statistics.quantiles(samples, n=20)[-1] * 1e6:8.1f} us"
+            )
+    finally:
+        await get_redis_strategy().destroy_token(session_token, user)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Compare list-response serialization paths on pages of ORM rows.
+
+Run from ``apps/backend``::
+
+    uv run python -m benchmarks.list_serialization --rows 1000
+
+``response_model`` is the previous ``list_items`` path: each row through
+``ItemRead.model_validate``, then FastAPI validating the list against the
+response model and dumping it with Pydantic. ``rows_response`` is the
+current path (``core.responses.dump_rows``). Rows are transient ``Item``
+instances, so no database is needed.
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.models.item import ItemRead
+from core.responses import dump_rows
+from core.schemas.item import Item
+
+
+def make_rows(count: int) -> list[Item]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        Item(
+            id=uuid.uuid4(),
+            title=f"Item {i}",
+            description=f"Description for item {i}" if i % 3 else None,
+            created_at=start + timedelta(seconds=i, microseconds=i * 7),
+            updated_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn: Callable[[], bytes], repeat: int) -> list[float]:
+    fn()  # warm up caches and lazily built validators
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    response_field = TypeAdapter(list[ItemRead])
+
+    def via_response_model() -> bytes:
+        items = [ItemRead.model_validate(row) for row in rows]
+        return response_field.dump_json(response_field.validate_python(items))
+
+    def via_rows_response() -> bytes:
+        return dump_rows(ItemRead, rows)
+
+    assert via_response_model() == via_rows_response(), "payloads differ"
+
+    print(f"{args.rows} rows/page, {args.repeat} iterations")
+    baseline = None
+    for name, fn in [("response_model", via_response_model), ("rows_response", via_rows_response)]:
+        samples = timed(fn, args.repeat)
+        median = statistics.median(samples)
+        baseline = baseline or median
+        print(
+            f"  {name:<15} median {median * 1000:7.3f} ms  "
+            f"p95 {statistics.quantiles(samples, n=20)[-1] * 1000:7.3f} ms  "
+            f"x{baseline / median:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare JSON and MessagePack payload size and encode/decode time for ItemRead lists.
+
+Run from ``apps/backend``::
+
+    uv run python -m benchmarks.msgpack_payloads --rows 1000
+
+Encoding is measured as the API does it: rows rendered to JSON by
+``core.responses.dump_rows`` and, for MessagePack, transcoded by
+``MessagePackMiddleware``. Decoding is what a client does with the body.
+Sizes are also given after gzip, since responses are usually compressed.
+"""
+
+import argparse
+import gzip
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+import msgpack
+import orjson
+
+from app.models.item import ItemRead
+from benchmarks.list_serialization import make_rows
+from core.responses import dump_rows
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    json_body = dump_rows(ItemRead, rows)
+    msgpack_body = msgpack.packb(orjson.loads(json_body))
+    assert msgpack.unpackb(msgpack_body) == orjson.loads(json_body), "payloads differ"
+
+    encoders: dict[str, Callable[[], Any]] = {
+        "json": lambda: dump_rows(ItemRead, rows),
+        "msgpack": lambda: msgpack.packb(orjson.loads(dump_rows(ItemRead, rows))),
+    }
+    decoders: dict[str, Callable[[], Any]] = {
+        "json": lambda: orjson.loads(json_body),
+        "msgpack": lambda: msgpack.unpackb(msgpack_body),
+    }
+    bodies = {"json": json_body, "msgpack": msgpack_body}
+
+    print(f"{args.rows} ItemRead rows, {args.repeat} iterations")
+    print(f"  {'format':<8} {'bytes':>9} {'gzip':>9} {'encode ms':>10} {'decode ms':>10}")
+    for name, body in bodies.items():
+        print(
+            f"  {name:<8} {len(body):>9} {len(gzip.compress(body)):>9} "
+            f"{median_ms(encoders[name], args.repeat):>10.3f} "
+            f"{median_ms(decoders[name], args.repeat):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Per-query latency with and without asyncpg's prepared-statement cache.
+
+Run from ``apps/backend`` against a direct Postgres connection::
+
+    uv run python -m benchmarks.statement_cache --queries 2000
+
+``direct`` uses the statement cache (``APP_DB_CONNECTION_MODE=direct``);
+``pgbouncer`` uses the settings for PgBouncer transaction pooling, where every
+execution has to prepare its statement again. The query joins two catalog
+tables so it needs no application schema.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import settings
+from core.database import ConnectionMode, connection_options
+
+QUERY = text(
+    "SELECT c.relname, n.nspname FROM pg_class c "
+    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+    "WHERE n.nspname = :schema ORDER BY c.oid LIMIT :limit"
+)
+
+
+async def measure(url: str, mode: ConnectionMode, queries: int) -> list[float]:
+    engine = create_async_engine(
+        url, connect_args=connection_options(mode, statement_cache_size=100), pool_size=1
+    )
+    samples = []
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(QUERY, {"schema": "pg_catalog", "limit": 20})
+            for _ in range(queries):
+                started = time.perf_counter()
+                await conn.execute(QUERY, {"schema": "pg_catalog", "limit": 20})
+                samples.append(time.perf_counter() - started)
+    finally:
+        await engine.dispose()
+    return samples
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=settings.APP_DB_URL)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.queries} queries per mode")
+    for mode in ("direct", "pgbouncer"):
+        samples = await measure(args.url, mode, args.queries)
+        print(
+            f"  {mode:<10} median {statistics.median(samples) * 1000:7.3f} ms  "
+            f"p95 {statistics.quantiles(samples, n=20)[-1] * 1000:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Throughput of concurrent single-item creates, committed per request vs write-behind.
+
+Run from ``apps/backend`` against Postgres::
+
+    uv run python -m benchmarks.write_behind --requests 2000 --concurrency 100
+
+Each simulated request inserts one item. ``per-request`` adds, commits and
+refreshes in its own session like ``POST /v1/items/``; ``write-behind``
+awaits a shared ``WriteBehindBuffer``. Tables are created in a throwaway
+schema that is dropped afterwards.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from core.config import settings
+from core.database import AppDbSession
+from core.schemas.base import AppDBModel
+from core.schemas.item import Item
+from core.write_behind import WriteBehindBuffer
+
+
+async def run(requests: int, concurrency: int, create: Callable[[int], Awaitable[None]]) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n: int) -> None:
+        async with semaphore:
+            await create(n)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(requests)))
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=settings.APP_DB_URL)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--max-rows", type=int, default=settings.WRITE_BEHIND_MAX_ROWS)
+    parser.add_argument("--max-delay-ms", type=int, default=settings.WRITE_BEHIND_MAX_DELAY_MS)
+    args = parser.parse_args()
+
+    schema = f"bench_{uuid.uuid4().hex[:8]}"
+    engine = create_async_engine(
+        args.url,
+        pool_size=20,
+        max_overflow=0,
+        # public stays on the path for the pg_trgm operator classes
+        connect_args={"server_settings": {"search_path": f'"{schema}", public'}},
+    )
+    session_maker = async_sessionmaker(
+        engine, sync_session_class=AppDbSession, expire_on_commit=False
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA public"))
+            await conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+            await conn.run_sync(AppDBModel.metadata.create_all)
+
+        async def per_request(n: int) -> None:
+            async with session_maker() as session:
+                item = Item(title=f"item {n}")
+                session.add(item)
+                await session.commit()
+                await session.refresh(item)
+
+        buffer = WriteBehindBuffer(
+            Item,
+            max_rows=args.max_rows,
+            max_delay_seconds=args.max_delay_ms / 1000,
+            session_maker=session_maker,
+        )
+
+        async def write_behind(n: int) -> None:
+            await buffer.insert({"title": f"item {n}"})
+
+        print(f"{args.requests} creates, {args.concurrency} concurrent")
+        for name, create in (("per-request", per_request), ("write-behind", write_behind)):
+            elapsed = await run(args.requests, args.concurrency, create)
+            print(f"  {name:<13} {elapsed:6.2f} s  {args.requests / elapsed:8.0f} rows/s")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE'))
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,260 @@
+"""High-throughput loading of streamed NDJSON/CSV through Postgres COPY.
+
+Rows are parsed incrementally from an async byte stream, validated against a
+Pydantic schema in batches, and each batch is pushed with asyncpg's
+``copy_records_to_table`` into a transaction-scoped staging table and merged
+into the target table with ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``.
+Only one batch, plus at most one record of ``max_record_bytes``, is held
+in memory at a time; longer records and undecodable lines are rejected like
+invalid rows.
+"""
+
+import csv
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal, cast
+
+from pydantic import BaseModel
+from pydantic import ValidationError as PydanticValidationError
+from sqlalchemy import Table, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.schemas.base import AppDBModel
+
+logger = logging.getLogger(__name__)
+
+LoadFormat = Literal["ndjson", "csv"]
+
+MAX_REPORTED_ERRORS = 100
+
+MAX_RECORD_BYTES = 1 << 20
+
+
+@dataclass
+class LoadProgress:
+    rows_read: int = 0
+    rows_loaded: int = 0
+    rows_rejected: int = 0
+    batches: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def reject(self, line: int, error: str) -> None:
+        self.rows_rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+
+# ---------------------------------------------------------------------------
+# Incremental parsing
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class LineError:
+    """Yielded by ``iter_lines`` in place of a line that cannot be read."""
+
+    message: str
+
+
+def _decode(line: bytearray) -> str | LineError:
+    try:
+        return line.rstrip(b"\r").decode()
+    except UnicodeDecodeError as exc:
+        return LineError(f"Invalid UTF-8 at byte {exc.start}")
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = MAX_RECORD_BYTES
+) -> AsyncIterator[str | LineError]:
+    """Split a byte stream into text lines, buffering at most `max_line_bytes`.
+
+    A longer line is discarded up to its newline and yields a ``LineError``,
+    as does a line that is not valid UTF-8.
+    """
+    too_long = LineError(f"Line exceeds {max_line_bytes} bytes")
+    pending = bytearray()
+    overlong = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if overlong or len(pending) + end - start > max_line_bytes:
+                yield too_long
+            else:
+                pending += chunk[start:end]
+                yield _decode(pending)
+            pending.clear()
+            overlong = False
+            start = end + 1
+        if overlong:
+            continue
+        if len(pending) + len(chunk) - start > max_line_bytes:
+            pending.clear()
+            overlong = True
+        else:
+            pending += chunk[start:]
+    if overlong:
+        yield too_long
+    elif pending.strip():
+        yield _decode(pending)
+
+
+async def iter_records(
+    chunks: AsyncIterator[bytes], fmt: LoadFormat, max_record_bytes: int = MAX_RECORD_BYTES
+) -> AsyncIterator[tuple[int, dict[str, Any] | str]]:
+    """Yield ``(line_number, record)`` pairs; unparsable input yields an error string.
+
+    CSV input needs a header row. A CSV record may span several lines inside a
+    quoted field; a record is complete once its quote count is even. A record
+    longer than `max_record_bytes` is skipped (tracking only its quotes) and
+    reported.
+    """
+    header: list[str] | None = None
+    record = ""
+    record_bytes = 0
+    quotes = 0
+    oversized = False
+    start = 0
+    line_number = 0
+    async for line in iter_lines(chunks, max_record_bytes):
+        line_number += 1
+        if isinstance(line, LineError):
+            # The line's quotes are unknown, so any CSV record it belongs to ends here
+            yield (start if record or oversized else line_number), line.message
+            record, record_bytes, quotes, oversized = "", 0, 0, False
+            continue
+        if fmt == "ndjson":
+            if not line.strip():
+                continue
+            try:
+                parsed = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_number, f"Invalid JSON: {exc.msg}"
+                continue
+            yield line_number, parsed if isinstance(parsed, dict) else "Expected a JSON object"
+            continue
+
+        if not record and not oversized:
+            start = line_number
+        quotes += line.count('"')
+        if not oversized:
+            record_bytes += len(line.encode()) + 1
+            if record_bytes > max_record_bytes:
+                record, oversized = "", True
+            else:
+                record = f"{record}\n{line}" if record else line
+        if quotes % 2:
+            continue
+        quotes, record_bytes = 0, 0
+        if oversized:
+            oversized = False
+            yield start, f"Record exceeds {max_record_bytes} bytes"
+            continue
+        (values,) = csv.reader([record])
+        record = ""
+        if header is None:
+            header = values
+        elif values:
+            yield start, dict(zip(header, values, strict=False))
+    if record or oversized:
+        yield start, "Unterminated quoted CSV field"
+
+
+# ---------------------------------------------------------------------------
+# COPY + merge
+# ---------------------------------------------------------------------------
+
+
+async def copy_merge(
+    session: AsyncSession,
+    model: type[AppDBModel],
+    columns: list[str],
+    records: list[tuple[Any, ...]],
+) -> int:
+    """COPY `records` into a staging table and merge them into `model`'s table.
+
+    Returns the number of rows inserted. Rows whose primary key already exists
+    are skipped. The caller commits; the staging table is dropped on commit.
+    """
+    target = cast(Table, model.__table__)
+    staging_name = f"_staging_{target.name}"
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    await session.execute(
+        text(
+            f'CREATE TEMP TABLE "{staging_name}" ON COMMIT DROP AS '
+            f'SELECT {column_list} FROM "{target.name}" WITH NO DATA'
+        )
+    )
+
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(  # type: ignore[union-attr]
+        staging_name, records=records, columns=columns
+    )
+
+    staging = table(staging_name, *(column(name) for name in columns))
+    stmt = (
+        insert(target)
+        .from_select(columns, select(*staging.c))
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+    result = await session.execute(stmt)
+    return int(result.rowcount)  # type: ignore[attr-defined]
+
+
+async def load_stream(
+    session: AsyncSession,
+    model: type[AppDBModel],
+    schema: type[BaseModel],
+    chunks: AsyncIterator[bytes],
+    fmt: LoadFormat,
+    batch_size: int,
+    on_progress: Callable[[LoadProgress], None] | None = None,
+    max_record_bytes: int = MAX_RECORD_BYTES,
+) -> LoadProgress:
+    """Validate and COPY a streamed upload into `model`, committing once per batch.
+
+    Each record is validated against `schema`; its fields (plus a generated
+    ``id``) become the copied columns. Invalid, undecodable or over-long
+    records are counted and reported by line number instead of aborting the
+    load.
+    """
+    columns = ["id", *schema.model_fields]
+    progress = LoadProgress()
+    batch: list[tuple[Any, ...]] = []
+
+    async def flush() -> None:
+        progress.rows_loaded += await copy_merge(session, model, columns, batch)
+        await session.commit()
+        progress.batches += 1
+        batch.clear()
+        logger.info(
+            "Loaded batch %d into %s (%d rows so far, %d rejected)",
+            progress.batches,
+            model.__tablename__,
+            progress.rows_loaded,
+            progress.rows_rejected,
+        )
+        if on_progress is not None:
+            on_progress(progress)
+
+    async for line_number, record in iter_records(chunks, fmt, max_record_bytes):
+        progress.rows_read += 1
+        if isinstance(record, str):
+            progress.reject(line_number, record)
+            continue
+        try:
+            validated = schema.model_validate(record)
+        except PydanticValidationError as exc:
+            progress.reject(line_number, exc.errors(include_url=False)[0]["msg"])
+            continue
+        batch.append((uuid.uuid4(), *validated.model_dump().values()))
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+    return progress
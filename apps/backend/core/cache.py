@@ -0,0 +1,274 @@
+"""Two-tier read-through caching of single rows.
+
+Reads check a bounded in-process LRU first, then Redis, then the loader.
+Invalidations delete the Redis key and are broadcast over Redis pub/sub so
+every worker process and replica drops its local copy.
+
+Usage in a router under ``app/api/``::
+
+    item_cache = ReadThroughCache(Item, ItemRead)
+
+    @router.get("/{item_id}", response_model=ItemRead)
+    @item_cache.read_through("item_id")
+    async def get_item(session: AppDbSessionDep, item_id: uuid.UUID) -> ItemRead: ...
+
+Write paths call ``await item_cache.invalidate(item_id)`` after committing.
+"""
+
+import asyncio
+import contextlib
+import functools
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from core.config import settings
+from core.redis import get_redis
+from core.schemas.base import AppDBModel, UserManagementDBModel
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# In-process tier
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class CacheStats:
+    local_hits: int = 0
+    local_misses: int = 0
+    redis_hits: int = 0
+    redis_misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class LocalLRUCache:
+    """Bounded LRU with a per-entry TTL. Not thread-safe; use from the event loop."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.local_misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.local_misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.local_hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def discard(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+@cache
+def get_local_cache() -> LocalLRUCache:
+    return LocalLRUCache(settings.CACHE_LOCAL_MAX_ENTRIES, settings.CACHE_LOCAL_TTL_SECONDS)
+
+
+def cache_stats() -> dict[str, int]:
+    """Counters for sizing the local tier, plus its current occupancy."""
+    local = get_local_cache()
+    return {**local.stats.as_dict(), "local_entries": len(local), "local_max": local.max_entries}
+
+
+# ---------------------------------------------------------------------------
+# Cross-process invalidation
+# ---------------------------------------------------------------------------
+
+
+class CacheInvalidationSubscriber:
+    """Evicts local entries for keys invalidated by any process.
+
+    Started and stopped from the application lifespan. Whenever the
+    subscription is (re)established the local tier is cleared, since
+    invalidations published while disconnected were missed.
+    """
+
+    def __init__(self, channel: str | None = None, retry_seconds: float = 1.0) -> None:
+        self.channel = channel or settings.CACHE_INVALIDATION_CHANNEL
+        self.retry_seconds = retry_seconds
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        local = get_local_cache()
+        while True:
+            try:
+                async with get_redis().pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    local.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        for key in message["data"].decode().split("\n"):
+                            local.discard(key)
+            except Exception:
+                # Any failure (e.g. an undecodable stray publish) must not end the
+                # task, or this process would serve stale local entries until TTL
+                logger.warning("Cache invalidation subscription lost; retrying", exc_info=True)
+                local.clear()
+                await asyncio.sleep(self.retry_seconds)
+
+
+# ---------------------------------------------------------------------------
+# Read-through cache
+# ---------------------------------------------------------------------------
+
+
+class ReadThroughCache[SchemaT: BaseModel]:
+    """Caches read schemas keyed by model table name and primary key.
+
+    Pass `namespace` to cache a second schema of the same model under its
+    own keys. Redis failures never fail a request: reads fall through to the
+    loader and writes are skipped, with a warning logged.
+    """
+
+    def __init__(
+        self,
+        model: type[AppDBModel | UserManagementDBModel],
+        schema: type[SchemaT],
+        ttl_seconds: int | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        self.namespace = f"cache:{namespace or model.__tablename__}"
+        self.schema = schema
+        self.ttl_seconds = ttl_seconds or settings.CACHE_TTL_SECONDS
+
+    def key(self, pk: Hashable) -> str:
+        return f"{self.namespace}:{pk}"
+
+    async def get(self, pk: Hashable) -> SchemaT | None:
+        if not settings.CACHE_ENABLED:
+            return None
+        key = self.key(pk)
+        local = get_local_cache()
+        value: SchemaT | None = local.get(key)
+        if value is not None:
+            return value
+        try:
+            payload = await get_redis().get(key)
+        except RedisError:
+            logger.warning("Cache read failed for %s", key, exc_info=True)
+            return None
+        if payload is None:
+            local.stats.redis_misses += 1
+            return None
+        local.stats.redis_hits += 1
+        value = self.schema.model_validate_json(payload)
+        local.set(key, value)
+        return value
+
+    async def set(self, pk: Hashable, value: SchemaT) -> None:
+        if not settings.CACHE_ENABLED:
+            return
+        key = self.key(pk)
+        get_local_cache().set(key, value)
+        try:
+            await get_redis().set(key, value.model_dump_json(), ex=self.ttl_seconds)
+        except RedisError:
+            logger.warning("Cache write failed for %s", key, exc_info=True)
+
+    async def invalidate(self, *pks: Hashable) -> None:
+        if not settings.CACHE_ENABLED or not pks:
+            return
+        keys = [self.key(pk) for pk in pks]
+        local = get_local_cache()
+        for key in keys:
+            local.discard(key)
+        try:
+            redis = get_redis()
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, "\n".join(keys))
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Cache invalidation failed for %s", self.namespace, exc_info=True)
+
+    async def get_or_load(
+        self,
+        pk: Hashable,
+        loader: Callable[[], Awaitable[SchemaT | None]],
+        store: bool = True,
+    ) -> SchemaT | None:
+        """Return the cached value for `pk`, populating it from `loader` on a miss.
+
+        Pass ``store=False`` when the loader may return stale data (e.g. it
+        reads from a replica) so the miss is not cached.
+        """
+        value = await self.get(pk)
+        if value is None:
+            value = await loader()
+            if value is not None and store:
+                await self.set(pk, value)
+        return value
+
+    def read_through(
+        self, pk_param: str
+    ) -> Callable[[Callable[..., Awaitable[SchemaT]]], Callable[..., Awaitable[SchemaT]]]:
+        """Decorate a route so its result is cached under the `pk_param` argument."""
+
+        def decorator(
+            endpoint: Callable[..., Awaitable[SchemaT]],
+        ) -> Callable[..., Awaitable[SchemaT]]:
+            @functools.wraps(endpoint)
+            async def wrapper(*args: Any, **kwargs: Any) -> SchemaT:
+                pk = kwargs[pk_param]
+                cached = await self.get(pk)
+                if cached is not None:
+                    return cached
+                value = await endpoint(*args, **kwargs)
+                await self.set(pk, value)
+                return value
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,170 @@
+"""gzip/Brotli response compression as pure ASGI middleware.
+
+The encoding is negotiated from ``Accept-Encoding`` (Brotli preferred when
+both are acceptable). Only responses whose media type is in the allowlist
+are compressed. Single-message responses below the size threshold are sent
+as-is. Streaming responses (``more_body``) are compressed chunk by chunk
+and flushed after every chunk, so NDJSON/CSV exports still reach the client
+incrementally instead of being buffered.
+"""
+
+import zlib
+from collections.abc import Iterable
+from typing import Protocol
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+ENCODINGS = ("br", "gzip")
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self, level: int) -> None:
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, quality: int) -> None:
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return bytes(self._brotli.process(data))
+
+    def flush(self) -> bytes:
+        return bytes(self._brotli.flush())
+
+    def finish(self) -> bytes:
+        return bytes(self._brotli.finish())
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> str | None:
+    """Pick the best of `available` (in preference order) allowed by `accept_encoding`."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best: tuple[float, str] | None = None
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > 0 and (best is None or weight > best[0]):
+            best = (weight, encoding)
+    return best[1] if best else None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        encodings: Iterable[str] = ENCODINGS,
+        media_types: Iterable[str] = ("application/json",),
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = [encoding for encoding in ENCODINGS if encoding in set(encodings)]
+        self.media_types = frozenset(media_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.encodings
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+    def compressor(self, encoding: str) -> _Compressor:
+        if encoding == "br":
+            return _BrotliCompressor(self.brotli_quality)
+        return _GzipCompressor(self.gzip_level)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._compressor: _Compressor | None = None
+        self._passthrough = False
+
+    def _eligible(self, headers: Headers) -> bool:
+        media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+        return media_type in self.middleware.media_types and "content-encoding" not in headers
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if self._eligible(headers):
+                # The representation depends on Accept-Encoding even when not compressed
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                self._start = message
+            else:
+                self._passthrough = True
+                await self._send(message)
+            return
+        if self._passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            self._compressor = self.middleware.compressor(self.encoding)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self._compressor.compress(body) + self._compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(start)
+
+        if self._compressor is None:
+            raise RuntimeError("Response body sent before http.response.start")
+        chunk = self._compressor.compress(body)
+        chunk += self._compressor.flush() if more_body else self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,195 @@
+"""MessagePack content negotiation for JSON APIs.
+
+``MessagePackMiddleware`` lets clients use ``application/msgpack`` instead of
+JSON on the routes under its path prefixes:
+
+- Request bodies sent with ``Content-Type: application/msgpack`` are decoded
+  and handed to the route as JSON, so request models validate unchanged.
+  Bodies over ``max_body_size`` bytes are rejected with 413 before decoding.
+- JSON responses are re-encoded as MessagePack when the ``Accept`` header
+  prefers it. Streaming and non-JSON responses (NDJSON, CSV) pass through.
+
+``document_msgpack`` adds the MessagePack media type next to every JSON
+request/response body in the OpenAPI schema for the same prefixes, so
+generated clients know they can negotiate it.
+"""
+
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import msgpack
+import orjson
+from fastapi import FastAPI
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.responses import ORJSONResponse
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset(
+    {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+)
+JSON_MEDIA_TYPE = "application/json"
+MAX_BODY_SIZE = 1 << 20
+
+
+def _media_type(header: str) -> str:
+    return header.partition(";")[0].strip().lower()
+
+
+def _under(path: str, prefixes: tuple[str, ...]) -> bool:
+    return any(path == prefix or path.startswith(prefix.rstrip("/") + "/") for prefix in prefixes)
+
+
+def prefers_msgpack(accept: str) -> bool:
+    """Whether an ``Accept`` header ranks MessagePack at least as high as JSON.
+
+    MessagePack must be listed explicitly; wildcards only ever select JSON.
+    """
+    msgpack_weight = 0.0
+    json_weight = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.partition(";")
+        media_type = media_type.strip().lower()
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_weight = max(msgpack_weight, weight)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            json_weight = max(json_weight, weight)
+    return msgpack_weight > 0 and msgpack_weight >= json_weight
+
+
+class MessagePackMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        path_prefixes: Iterable[str] = ("/",),
+        max_body_size: int = MAX_BODY_SIZE,
+    ) -> None:
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _under(scope["path"], self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        send = _MessagePackResponder(send, prefers_msgpack(headers.get("accept", ""))).send
+
+        if _media_type(headers.get("content-type", "")) not in MSGPACK_MEDIA_TYPES:
+            await self.app(scope, receive, send)
+            return
+
+        too_large = ORJSONResponse(
+            {"detail": f"MessagePack body exceeds {self.max_body_size} bytes"}, status_code=413
+        )
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_body_size:
+            await too_large(scope, receive, send)
+            return
+
+        # Chunked requests carry no Content-Length, so the running size is checked too
+        packed = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            packed += message.get("body", b"")
+            if len(packed) > self.max_body_size:
+                await too_large(scope, receive, send)
+                return
+            more_body = message.get("more_body", False)
+        try:
+            body = orjson.dumps(msgpack.unpackb(packed)) if packed else b""
+        except (ValueError, TypeError, msgpack.UnpackException):
+            response = ORJSONResponse({"detail": "Invalid MessagePack body"}, status_code=400)
+            await response(scope, receive, send)
+            return
+
+        request_headers = MutableHeaders(scope={**scope, "headers": list(scope["headers"])})
+        request_headers["Content-Type"] = JSON_MEDIA_TYPE
+        request_headers["Content-Length"] = str(len(body))
+        scope = {**scope, "headers": request_headers.raw}
+        sent = False
+
+        async def receive_json() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, receive_json, send)
+
+
+class _MessagePackResponder:
+    """Marks JSON responses as negotiable and, if `transcode`, re-encodes them as MessagePack."""
+
+    def __init__(self, send: Send, transcode: bool) -> None:
+        self._send = send
+        self._transcode = transcode
+        self._start: Message | None = None
+        self._body = b""
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if _media_type(headers.get("content-type", "")) == JSON_MEDIA_TYPE:
+                headers.add_vary_header("Accept")
+                if self._transcode:
+                    self._start = message
+                    return
+            await self._send(message)
+            return
+        if self._start is None or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        self._body += message.get("body", b"")
+        if message.get("more_body", False):
+            return
+        start, self._start = self._start, None
+        body = self._body
+        if body:
+            body = msgpack.packb(orjson.loads(body))
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Type"] = MSGPACK_MEDIA_TYPE
+            headers["Content-Length"] = str(len(body))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body})
+
+
+def _add_msgpack_content(content: dict[str, Any]) -> None:
+    if JSON_MEDIA_TYPE in content:
+        content.setdefault(MSGPACK_MEDIA_TYPE, content[JSON_MEDIA_TYPE])
+
+
+def document_msgpack(app: FastAPI, path_prefixes: Iterable[str]) -> None:
+    """Advertise MessagePack alongside JSON bodies in the app's OpenAPI schema."""
+    prefixes = tuple(path_prefixes)
+    build_openapi: Callable[[], dict[str, Any]] = app.openapi
+
+    def openapi() -> dict[str, Any]:
+        if app.openapi_schema is None:
+            schema = build_openapi()
+            for path, operations in schema.get("paths", {}).items():
+                if not _under(path, prefixes):
+                    continue
+                for operation in operations.values():
+                    if not isinstance(operation, dict):
+                        continue
+                    _add_msgpack_content(operation.get("requestBody", {}).get("content", {}))
+                    for response in operation.get("responses", {}).values():
+                        _add_msgpack_content(response.get("content", {}))
+        return app.openapi_schema  # type: ignore[return-value]
+
+    app.openapi = openapi  # type: ignore[method-assign]
@@ -1,43 +1,142 @@
-from collections.abc import AsyncGenerator
+import json
+import uuid
+from collections.abc import AsyncGenerator, Mapping, Sequence
 from contextlib import AbstractAsyncContextManager
 from functools import cache
-from typing import Annotated
+from typing import Annotated, Any, Literal
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy import (
+    Boolean,
+    ColumnElement,
+    Text,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    event,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+    values,
+)
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import types as sa_types
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.util import await_only
 
 from core.config import settings
+from core.pools import InstrumentedPool, instrument, pool_status
+from core.query_cache import WRITTEN_TABLES, invalidate_tags
+from core.query_stats import instrument_queries
+from core.replicas import (
+    REPLICA_SESSION,
+    ReplicaSet,
+    prefers_primary,
+    record_write,
+)
+from core.schemas.base import AppDBModel
 
 # ---------------------------------------------------------------------------
 # Engine factories (cached singletons)
 # ---------------------------------------------------------------------------
 
 
+ConnectionMode = Literal["direct", "pgbouncer"]
+
+
+def connection_options(mode: ConnectionMode, statement_cache_size: int) -> dict[str, Any]:
+    """asyncpg ``connect_args`` for a direct or PgBouncer (transaction mode) connection.
+
+    Direct connections keep asyncpg's prepared-statement cache (and SQLAlchemy's
+    cache of prepared statements per connection), so hot queries skip
+    parse/plan round trips. Behind PgBouncer consecutive transactions may run
+    on different server connections, so both caches are disabled and any
+    statement that is still prepared gets a unique name to avoid collisions.
+    """
+    if mode == "pgbouncer":
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": statement_cache_size,
+        "prepared_statement_cache_size": statement_cache_size,
+    }
+
+
+def _create_engine(url: str, name: str, database: Literal["APP_DB", "USERS_DB"]) -> AsyncEngine:
+    """Engine with the connection and pool settings of `database` (``APP_DB_*`` etc.)."""
+    mode: ConnectionMode = getattr(settings, f"{database}_CONNECTION_MODE")
+    pre_ping = getattr(settings, f"{database}_POOL_PRE_PING")
+    if pre_ping is None:
+        # PgBouncer checks its server connections itself; a ping would only
+        # add a round trip to the bouncer on every checkout
+        pre_ping = mode == "direct"
+    engine = create_async_engine(
+        url,
+        echo=settings.DEBUG,
+        connect_args=connection_options(
+            mode, getattr(settings, f"{database}_STATEMENT_CACHE_SIZE")
+        ),
+        poolclass=InstrumentedPool,
+        pool_size=getattr(settings, f"{database}_POOL_SIZE"),
+        max_overflow=getattr(settings, f"{database}_MAX_OVERFLOW"),
+        pool_timeout=getattr(settings, f"{database}_POOL_TIMEOUT"),
+        pool_recycle=getattr(settings, f"{database}_POOL_RECYCLE"),
+        pool_pre_ping=pre_ping,
+    )
+    instrument_queries(engine, settings.DB_SLOW_QUERY_SECONDS)
+    return instrument(engine, name, settings.DB_POOL_WAIT_WARNING_SECONDS)
+
+
 @cache
 def get_app_db_engine() -> AsyncEngine:
-    return create_async_engine(
-        settings.APP_DB_URL,
-        echo=settings.DEBUG,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,
+    return _create_engine(settings.APP_DB_URL, "app_db", "APP_DB")
+
+
+@cache
+def get_app_db_replicas() -> ReplicaSet:
+    urls = [url.strip() for url in settings.APP_DB_REPLICA_URLS.split(",") if url.strip()]
+    engines = [
+        _create_engine(url, f"app_db_replica_{index}", "APP_DB") for index, url in enumerate(urls)
+    ]
+    return ReplicaSet(
+        engines,
+        selection=settings.APP_DB_REPLICA_SELECTION,
+        eject_seconds=settings.APP_DB_REPLICA_EJECT_SECONDS,
     )
 
 
 @cache
 def get_users_db_engine() -> AsyncEngine:
-    return create_async_engine(
-        settings.USERS_DB_URL,
-        echo=settings.DEBUG,
-        pool_size=10,
-        max_overflow=20,
-        pool_pre_ping=True,
-    )
+    return _create_engine(settings.USERS_DB_URL, "users_db", "USERS_DB")
+
+
+def pool_statuses() -> dict[str, dict[str, Any]]:
+    """Pool occupancy and checkout stats for every engine of this process."""
+    engines = {
+        "app_db": get_app_db_engine(),
+        **{
+            f"app_db_replica_{index}": engine
+            for index, engine in enumerate(get_app_db_replicas().engines)
+        },
+        "users_db": get_users_db_engine(),
+    }
+    return {name: pool_status(engine) for name, engine in engines.items()}
 
 
 # ---------------------------------------------------------------------------
@@ -45,9 +144,57 @@ def get_users_db_engine() -> AsyncEngine:
 # ---------------------------------------------------------------------------
 
 
+class AppDbSession(Session):
+    """Sync session class behind app_db sessions.
+
+    Records writes for read-your-writes and collects the tables written in
+    the current transaction, whose query-cache tags are bumped after commit.
+    """
+
+
+def _written_tables(session: Session) -> set[str]:
+    tables: set[str] = session.info.setdefault(WRITTEN_TABLES, set())
+    return tables
+
+
+@event.listens_for(AppDbSession, "do_orm_execute")
+def _record_statement_write(orm_execute_state: ORMExecuteState) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        record_write()
+        table = orm_execute_state.statement.table  # type: ignore[attr-defined]
+        _written_tables(orm_execute_state.session).add(table.name)
+
+
+@event.listens_for(AppDbSession, "after_flush")
+def _record_flush_write(session: Session, flush_context: Any) -> None:
+    record_write()
+    tables = _written_tables(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        tables.update(table.name for table in sa_inspect(obj).mapper.tables)
+
+
+@event.listens_for(AppDbSession, "after_commit")
+def _invalidate_written_tables(session: Session) -> None:
+    tables = session.info.pop(WRITTEN_TABLES, None)
+    if tables and settings.QUERY_CACHE_ENABLED:
+        # Commit runs inside the AsyncSession's greenlet, so Redis is awaited
+        # here and the tags are bumped before ``await session.commit()`` returns
+        await_only(invalidate_tags(*tables))
+
+
+@event.listens_for(AppDbSession, "after_rollback")
+def _discard_written_tables(session: Session) -> None:
+    session.info.pop(WRITTEN_TABLES, None)
+
+
 @cache
 def get_app_db_session_maker() -> async_sessionmaker[AsyncSession]:
-    return async_sessionmaker(bind=get_app_db_engine(), class_=AsyncSession, expire_on_commit=False)
+    return async_sessionmaker(
+        bind=get_app_db_engine(),
+        class_=AsyncSession,
+        sync_session_class=AppDbSession,
+        expire_on_commit=False,
+    )
 
 
 @cache
@@ -74,10 +221,212 @@ async def get_users_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def _replica_session() -> AsyncSession | None:
+    """A session on the best healthy replica, ejecting any that cannot connect."""
+    replicas = get_app_db_replicas()
+    for engine in replicas.candidates():
+        session = AsyncSession(bind=engine, expire_on_commit=False, info={REPLICA_SESSION: True})
+        try:
+            await session.connection()
+        except (DBAPIError, OSError):
+            await session.close()
+            replicas.eject(engine)
+            continue
+        return session
+    return None
+
+
+async def get_app_db_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: a replica when configured, else the primary.
+
+    Clients that wrote within ``APP_DB_READ_YOUR_WRITES_SECONDS`` read from
+    the primary so they see their own changes.
+    """
+    session = None if prefers_primary(request) else await _replica_session()
+    if session is None:
+        session = get_app_db_session_maker()()
+    async with session:
+        yield session
+
+
 AppDbSessionDep = Annotated[AsyncSession, Depends(get_app_db_session)]
+AppDbReadSessionDep = Annotated[AsyncSession, Depends(get_app_db_read_session)]
 UsersDbSessionDep = Annotated[AsyncSession, Depends(get_users_db_session)]
 
 
+# ---------------------------------------------------------------------------
+# Single-statement mutations (UPDATE/DELETE ... RETURNING)
+# ---------------------------------------------------------------------------
+
+
+async def update_returning[ModelT: AppDBModel](
+    session: AsyncSession,
+    model: type[ModelT],
+    pk: uuid.UUID,
+    changes: Mapping[str, Any],
+    *criteria: ColumnElement[bool],
+) -> ModelT | None:
+    """Update one row with ``UPDATE ... RETURNING *`` and return it, or None if no row matched.
+
+    Extra `criteria` (e.g. an expected ``updated_at``) are ANDed into the WHERE
+    clause. An empty `changes` mapping degrades to a plain SELECT with the same
+    criteria so the row (and its ``updated_at``) is left untouched.
+    """
+    if not changes:
+        unchanged: ModelT | None = await session.scalar(
+            select(model).where(model.id == pk, *criteria)
+        )
+        return unchanged
+    stmt = (
+        update(model)
+        .where(model.id == pk, *criteria)
+        .values(dict(changes))
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+    updated: ModelT | None = await session.scalar(stmt)
+    return updated
+
+
+async def delete_returning(
+    session: AsyncSession, model: type[AppDBModel], pk: uuid.UUID
+) -> uuid.UUID | None:
+    """Delete one row with ``DELETE ... RETURNING id``; None means it did not exist."""
+    stmt = (
+        delete(model)
+        .where(model.id == pk)
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    deleted_id: uuid.UUID | None = await session.scalar(stmt)
+    return deleted_id
+
+
+# ---------------------------------------------------------------------------
+# Set-based bulk statements (one round trip per batch, not per row)
+# ---------------------------------------------------------------------------
+
+
+async def bulk_insert_returning[ModelT: AppDBModel](
+    session: AsyncSession, model: type[ModelT], rows: Sequence[Mapping[str, Any]]
+) -> list[ModelT]:
+    """Insert `rows` as a multi-row ``INSERT ... RETURNING``, in input order."""
+    if not rows:
+        return []
+    stmt = insert(model).returning(model, sort_by_parameter_order=True)
+    result = await session.scalars(stmt, [dict(row) for row in rows])
+    return list(result.all())
+
+
+async def bulk_update_returning[ModelT: AppDBModel](
+    session: AsyncSession,
+    model: type[ModelT],
+    rows: Sequence[Mapping[str, Any]],
+    fields: Sequence[str],
+) -> list[ModelT]:
+    """Apply per-row partial updates as one ``UPDATE ... FROM (VALUES ...) RETURNING``.
+
+    Each row carries an ``id`` plus any subset of `fields`; fields missing from
+    a row keep their current value. Rows whose id does not exist are simply
+    absent from the result.
+    """
+    if not rows:
+        return []
+    table = model.__table__
+    payload_columns = [column("id", table.c.id.type)]
+    for field in fields:
+        payload_columns += [column(field, table.c[field].type), column(f"{field}__set", Boolean())]
+
+    data = []
+    for row in rows:
+        record: list[Any] = [row["id"]]
+        for field in fields:
+            record += [row.get(field), field in row]
+        data.append(tuple(record))
+    payload = values(*payload_columns, name="payload").data(data)
+
+    stmt = (
+        update(model)
+        .where(model.id == payload.c.id)
+        .values(
+            {
+                field: case((payload.c[f"{field}__set"], payload.c[field]), else_=table.c[field])
+                for field in fields
+            }
+        )
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.scalars(stmt)
+    return list(result.all())
+
+
+async def bulk_delete_returning(
+    session: AsyncSession, model: type[AppDBModel], ids: Sequence[uuid.UUID]
+) -> list[uuid.UUID]:
+    """Delete rows with ``DELETE ... WHERE id = ANY(:ids) RETURNING id``."""
+    if not ids:
+        return []
+    ids_param = bindparam("ids", list(ids), type_=ARRAY(UUID(as_uuid=True)))
+    stmt = (
+        delete(model)
+        .where(model.id == any_(ids_param))
+        .returning(model.id)
+        .execution_options(synchronize_session=False)
+    )
+    result = await session.scalars(stmt)
+    return list(result.all())
+
+
+# ---------------------------------------------------------------------------
+# Database-side JSON rendering
+# ---------------------------------------------------------------------------
+
+_JSON_PASSTHROUGH_TYPES = (sa_types.String, sa_types.Integer, sa_types.Boolean, sa_types.Uuid)
+
+
+def _json_value(attribute: Any) -> ColumnElement[str]:
+    """SQL text for one column, formatted the way Pydantic serializes its Python value."""
+    column_type = attribute.type
+    if isinstance(column_type, sa_types.DateTime):
+        moment = func.timezone("UTC", attribute) if column_type.timezone else attribute
+        micros = func.to_char(moment, "US", type_=Text)
+        rendered = (
+            func.to_char(moment, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text)
+            + case((micros == "000000", ""), else_="." + micros)
+            + ("Z" if column_type.timezone else "")
+        )
+        value = '"' + rendered + '"'
+    elif isinstance(column_type, _JSON_PASSTHROUGH_TYPES):
+        value = cast(func.to_json(attribute), Text)
+    else:
+        raise TypeError(f"No byte-compatible JSON rendering for {attribute.key}: {column_type!r}")
+    return func.coalesce(value, literal("null", Text))
+
+
+def json_row(model: type[AppDBModel], fields: Sequence[str]) -> ColumnElement[str]:
+    """A column rendering each row of `model` as a compact JSON object of `fields`.
+
+    The text matches Pydantic's ``model_dump_json()`` for a read schema with
+    those fields (same key order, separators, string escapes and datetime
+    format), so it can be returned to clients as-is. ``json_build_object`` and
+    ``row_to_json`` are not used because they add whitespace after separators.
+    """
+    parts: list[ColumnElement[str]] = []
+    for position, name in enumerate(fields):
+        key = json.dumps(name)
+        parts += [
+            literal(("{" if position == 0 else ",") + key + ":", Text),
+            _json_value(getattr(model, name)),
+        ]
+    return func.concat(*parts, literal("}", Text)).label("json")
+
+
+def json_array(rendered: Sequence[str]) -> bytes:
+    """Join rows rendered by `json_row` into a JSON array body."""
+    return ("[" + ",".join(rendered) + "]").encode()
+
+
 # ---------------------------------------------------------------------------
 # PostgresProvider (lifecycle management)
 # ---------------------------------------------------------------------------
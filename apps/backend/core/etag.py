@@ -0,0 +1,71 @@
+"""Weak ETags derived from a row's primary key and ``updated_at``.
+
+A row's ETag is ``W/"<pk>.<updated_at in epoch microseconds>"``, so it can be
+computed from a ``SELECT updated_at`` (or a cached read schema) without
+loading or serializing the row, and parsed back into the exact ``updated_at``
+value for optimistic-concurrency checks on writes.
+"""
+
+import hashlib
+from collections.abc import Hashable, Iterable
+from datetime import UTC, datetime, timedelta
+
+from fastapi import Response, status
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _micros(moment: datetime) -> int:
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+
+def make_etag(pk: Hashable, updated_at: datetime) -> str:
+    return f'W/"{pk}.{_micros(updated_at)}"'
+
+
+def collection_etag(versions: Iterable[tuple[Hashable, datetime]], *extra: object) -> str:
+    """ETag for a page of rows: changes if any row is added, removed or updated.
+
+    `extra` values (e.g. whether a next page exists) are mixed into the digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(extra).encode())
+    for pk, updated_at in versions:
+        digest.update(f"{pk}.{_micros(updated_at)};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _split(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag.removeprefix("W/")
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """Weak comparison of `etag` against an ``If-None-Match``/``If-Match`` header."""
+    if not header:
+        return False
+    tags = _split(header)
+    return "*" in tags or _opaque(etag) in {_opaque(tag) for tag in tags}
+
+
+def parse_versions(header: str, pk: Hashable) -> list[datetime] | None:
+    """Return the ``updated_at`` values that `header` names for `pk`.
+
+    ``None`` means the header is ``*`` (any current version matches).
+    """
+    tags = _split(header)
+    if "*" in tags:
+        return None
+    versions = []
+    for tag in tags:
+        tag_pk, _, micros = _opaque(tag).strip('"').rpartition(".")
+        if tag_pk == str(pk) and micros.isdigit():
+            versions.append(EPOCH + timedelta(microseconds=int(micros)))
+    return versions
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
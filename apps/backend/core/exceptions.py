@@ -14,3 +14,12 @@ def __init__(self, detail: str = "Permission denied") -> None:
 class ValidationError(HTTPException):
     def __init__(self, detail: str = "Validation error") -> None:
         super().__init__(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail)
+
+
+class ServiceUnavailableError(HTTPException):
+    def __init__(self, detail: str = "Service unavailable", retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
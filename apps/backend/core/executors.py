@@ -0,0 +1,41 @@
+"""Thread pools for CPU-bound work that must not run on the event loop.
+
+``BoundedExecutor`` runs at most ``workers`` jobs at a time and queues at
+most ``queue_limit`` more. When both are full, ``run`` fails immediately
+with a 503 instead of queueing further. A burst then gets fast "retry"
+responses rather than ever-growing latency for every caller. Slots are
+released when a job finishes, even if its caller was cancelled meanwhile.
+
+Use threads only for work that releases the GIL (e.g. argon2/bcrypt in C);
+pure-Python work would still serialize on the interpreter.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from core.exceptions import ServiceUnavailableError
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, workers: int, queue_limit: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.capacity = workers + queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+
+    async def run[T](self, fn: Callable[..., T], *args: object) -> T:
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError(f"{self.name} is saturated; retry shortly")
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
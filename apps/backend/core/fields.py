@@ -0,0 +1,66 @@
+"""Sparse fieldsets: ``?fields=id,title`` selects and serializes only those columns.
+
+Usage in a list route::
+
+    fields: list[str] | None = Depends(SparseFields(ItemRead))
+    ...
+    if fields is not None:
+        stmt = select(*project_columns(Item, fields, Item.id))
+        rows = (await session.execute(stmt)).all()
+        return rows_response(ItemRead, rows, fields)
+
+Field names are validated against the read schema, so only attributes that
+are already part of the public response can be requested.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement
+from sqlalchemy.orm import QueryableAttribute
+
+from core.exceptions import ValidationError
+from core.schemas.base import AppDBModel
+
+
+class SparseFields:
+    """Dependency that parses a comma-separated ``fields`` query parameter.
+
+    Resolves to ``None`` when the parameter is absent (return every field).
+    """
+
+    def __init__(self, schema: type[BaseModel]) -> None:
+        self.schema = schema
+
+    def __call__(
+        self,
+        fields: str | None = Query(
+            None, description="Comma-separated subset of response fields to return"
+        ),
+    ) -> list[str] | None:
+        if fields is None:
+            return None
+        requested = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in requested if name not in self.schema.model_fields]
+        if not requested or unknown:
+            raise ValidationError(
+                f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+            )
+        # Keep the schema's field order so payloads are stable
+        return [name for name in self.schema.model_fields if name in requested]
+
+
+def project_columns(
+    model: type[AppDBModel],
+    fields: Sequence[str],
+    *extra: ColumnElement[Any] | QueryableAttribute[Any],
+) -> list[ColumnElement[Any] | QueryableAttribute[Any]]:
+    """Columns for `fields`, plus any `extra` columns or mapped attributes the route needs."""
+    columns: list[ColumnElement[Any] | QueryableAttribute[Any]] = [
+        getattr(model, name) for name in fields
+    ]
+    names = set(fields)
+    columns += [column for column in extra if column.key not in names]
+    return columns
@@ -0,0 +1,44 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens that encode the sort key of the last row
+of a page. The next page is fetched with a row-value comparison
+(``(created_at, id) > (:created_at, :id)``) that is served directly by a
+composite index, so latency stays flat no matter how deep the client pages.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from sqlalchemy import ColumnElement, tuple_
+
+from core.exceptions import ValidationError
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort-key values of the last row of a page into an opaque token."""
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *parsers: Callable[[str], Any]) -> tuple[Any, ...]:
+    """Decode a token produced by `encode_cursor`, parsing each value in order.
+
+    Raises `ValidationError` if the token is malformed or does not match the
+    expected number of values.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor arity mismatch")
+        return tuple(parse(value) for parse, value in zip(parsers, values, strict=True))
+    except (ValueError, TypeError, binascii.Error) as exc:
+        raise ValidationError("Invalid pagination cursor") from exc
+
+
+def after_keyset(columns: Sequence[Any], values: Sequence[Any]) -> ColumnElement[bool]:
+    """Build a row-value comparison selecting rows strictly after `values`."""
+    return tuple_(*columns) > tuple_(*values, types=[column.type for column in columns])
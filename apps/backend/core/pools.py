@@ -0,0 +1,128 @@
+"""Connection pools that measure how long checkouts wait.
+
+``InstrumentedPool`` is used as the ``poolclass`` of every engine. Each
+checkout is timed (queue wait plus, when the pool grows into its overflow,
+connection setup) into a ``PoolStats`` histogram. Checkouts that give up
+after ``pool_timeout`` are counted, and a warning is logged (at most every
+``WARN_INTERVAL_SECONDS``) when a checkout waits longer than the configured
+threshold, which usually means the pool is too small for the worker's
+concurrency or Postgres is saturated.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the wait-time histogram buckets; the last bucket is unbounded
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+WARN_INTERVAL_SECONDS = 10.0
+
+
+@dataclass
+class PoolStats:
+    name: str = "pool"
+    warn_wait_seconds: float | None = None
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS) + 1))
+    _last_warning: float = field(default=0.0, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def observe(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, waited)] += 1
+            warn = (
+                self.warn_wait_seconds is not None
+                and waited > self.warn_wait_seconds
+                and time.monotonic() - self._last_warning > WARN_INTERVAL_SECONDS
+            )
+            if warn:
+                self._last_warning = time.monotonic()
+        if warn:
+            logger.warning(
+                "Waited %.3fs for a %s connection (threshold %.3fs, %d timeouts so far)",
+                waited,
+                self.name,
+                self.warn_wait_seconds,
+                self.timeouts,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in WAIT_BUCKETS] + ["le_inf"]
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "wait_histogram": dict(zip(labels, self.wait_buckets, strict=True)),
+        }
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - started)
+        return entry
+
+    def recreate(self) -> "InstrumentedPool":
+        # Keep counting across engine.dispose()
+        pool = super().recreate()
+        if not isinstance(pool, InstrumentedPool):
+            raise TypeError(f"recreate() returned {type(pool).__name__}, not InstrumentedPool")
+        pool.stats = self.stats
+        return pool
+
+
+def instrument(engine: AsyncEngine, name: str, warn_wait_seconds: float | None) -> AsyncEngine:
+    """Label `engine`'s pool for stats and logging; a no-op for other pool classes."""
+    pool = engine.pool
+    if isinstance(pool, InstrumentedPool):
+        pool.stats = PoolStats(name=name, warn_wait_seconds=warn_wait_seconds)
+    return engine
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Live occupancy of `engine`'s pool plus its accumulated checkout stats."""
+    pool = engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status |= {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            # QueuePool counts up from -size until every base connection exists
+            "overflow": max(pool.overflow(), 0),
+            "timeout_seconds": pool.timeout(),
+        }
+    if isinstance(pool, InstrumentedPool):
+        status |= pool.stats.as_dict()
+    return status
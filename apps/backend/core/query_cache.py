@@ -0,0 +1,189 @@
+"""Redis cache for the results of expensive SELECTs, invalidated by table tags.
+
+Caching is opt-in per query::
+
+    counts = QueryCache(ttl_seconds=60)
+
+    rows = await counts.fetch(
+        session,
+        select(Item.title, func.count()).group_by(Item.title),
+        list[TitleCount],
+    )
+
+Entries are keyed on the compiled SQL, its bound parameters and the current
+version of every tag (by default, the tables the statement reads). Each
+``AppDbSession`` (see ``core.database``) records the tables it writes
+(flushed ORM objects and INSERT/UPDATE/DELETE statements) and bumps their
+tag versions after commit, so dependent entries are never read again and
+simply expire. Writes made on the raw driver connection (e.g. COPY) are not
+seen; call ``invalidate_tags`` for those.
+
+Tag bumps cost a Redis round trip on every writing commit, so both they and
+``QueryCache`` are off unless ``QUERY_CACHE_ENABLED`` is set; a disabled
+``QueryCache`` always runs the query.
+
+On a miss, one caller per key takes a short Redis lock and runs the query
+while the others poll for its result, so a popular entry expiring does not
+send every concurrent request to Postgres at once. The lock holds a random
+token and is only released by the caller that set it.
+"""
+
+import asyncio
+import hashlib
+import logging
+import secrets
+import time
+from collections.abc import Iterable
+from functools import cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from redis.exceptions import RedisError
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.util import find_tables
+
+from core.config import settings
+from core.redis import get_redis
+from core.replicas import is_replica_session
+from core.schemas.base import AppDBModel
+
+logger = logging.getLogger(__name__)
+
+QUERY_CACHE_PREFIX = "qcache"
+
+# session.info key holding the app_db tables written in the current transaction
+WRITTEN_TABLES = "query_cache_written_tables"
+
+LOCK_POLL_SECONDS = 0.05
+
+# Delete KEYS[1] only while it still holds this caller's token (ARGV[1])
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def tag_key(tag: str) -> str:
+    return f"{QUERY_CACHE_PREFIX}:tag:{tag}"
+
+
+def statement_tags(stmt: Select[Any]) -> set[str]:
+    """Names of the app_db tables `stmt` reads, including joins and subqueries."""
+    tables = find_tables(stmt, include_aliases=True, include_joins=True, include_crud=True)
+    return {table.name for table in tables if table.name in AppDBModel.metadata.tables}
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """Bump the version of each tag, orphaning every entry that depends on it."""
+    if not tags:
+        return
+    try:
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for tag in sorted(tags):
+                pipe.incr(tag_key(tag))
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Query cache invalidation failed for %s", sorted(tags), exc_info=True)
+
+
+@cache
+def _adapter(result_type: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(result_type)
+
+
+class QueryCache:
+    """Caches SELECT results as JSON validated against a result type.
+
+    Redis failures never fail a request: the query runs uncached, with a
+    warning logged.
+    """
+
+    def __init__(self, ttl_seconds: int | None = None, lock_seconds: float | None = None) -> None:
+        self.ttl_seconds = ttl_seconds or settings.QUERY_CACHE_TTL_SECONDS
+        self.lock_seconds = lock_seconds or settings.QUERY_CACHE_LOCK_SECONDS
+
+    async def key(
+        self, session: AsyncSession, stmt: Select[Any], result_type: Any, tags: Iterable[str]
+    ) -> str:
+        compiled = stmt.compile(session.get_bind())
+        tags = sorted(tags)
+        versions = await get_redis().mget([tag_key(tag) for tag in tags]) if tags else []
+        digest = hashlib.blake2b(digest_size=16)
+        parts = (compiled.string, sorted(compiled.params.items()), result_type, tags, versions)
+        for part in parts:
+            digest.update(repr(part).encode())
+        return f"{QUERY_CACHE_PREFIX}:{digest.hexdigest()}"
+
+    async def fetch(
+        self,
+        session: AsyncSession,
+        stmt: Select[Any],
+        result_type: Any,
+        tags: Iterable[str] | None = None,
+    ) -> Any:
+        """Return the rows of `stmt` validated as `result_type`, from cache when possible.
+
+        `result_type` describes the whole result, e.g. ``list[ItemRead]`` for
+        ``select(Item)`` or ``list[int]`` for a single column; other selects
+        produce one mapping per row. `tags` replaces the tables read by
+        `stmt` as invalidation tags.
+
+        The cache is bypassed when the session has uncommitted writes to a
+        tagged table, and results read from a replica are not stored.
+        """
+        adapter = _adapter(result_type)
+        tags = statement_tags(stmt) if tags is None else set(tags)
+        if not settings.QUERY_CACHE_ENABLED or tags & session.info.get(WRITTEN_TABLES, set()):
+            return await self._execute(session, stmt, adapter)
+
+        lock_token: str | None = None
+        try:
+            redis = get_redis()
+            key = await self.key(session, stmt, result_type, tags)
+            payload = await redis.get(key)
+            if payload is None:
+                lock_token = secrets.token_hex(8)
+                if not await redis.set(
+                    f"{key}:lock", lock_token, nx=True, px=int(self.lock_seconds * 1000)
+                ):
+                    # Another caller holds the lock; if it lapses we load without one
+                    lock_token = None
+                    payload = await self._wait_for(key)
+        except RedisError:
+            logger.warning("Query cache read failed", exc_info=True)
+            return await self._execute(session, stmt, adapter)
+        if payload is not None:
+            return adapter.validate_json(payload)
+
+        value = await self._execute(session, stmt, adapter)
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                if not is_replica_session(session):
+                    pipe.set(key, adapter.dump_json(value), ex=self.ttl_seconds)
+                if lock_token is not None:
+                    release = redis.register_script(RELEASE_LOCK_SCRIPT)
+                    await release(keys=[f"{key}:lock"], args=[lock_token], client=pipe)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Query cache write failed for %s", key, exc_info=True)
+        return value
+
+    async def _wait_for(self, key: str) -> bytes | str | None:
+        """Poll for the entry another caller is loading; None if its lock lapses first."""
+        redis = get_redis()
+        deadline = time.monotonic() + self.lock_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_SECONDS)
+            payload = await redis.get(key)
+            if payload is not None or not await redis.exists(f"{key}:lock"):
+                return payload
+        return None
+
+    @staticmethod
+    async def _execute(session: AsyncSession, stmt: Select[Any], adapter: TypeAdapter[Any]) -> Any:
+        result = await session.execute(stmt)
+        rows = result.scalars().all() if len(result.keys()) == 1 else result.mappings().all()
+        return adapter.validate_python(rows, from_attributes=True)
@@ -0,0 +1,143 @@
+"""Per-request SQL instrumentation.
+
+``instrument_queries`` attaches cursor-execute hooks to an engine. While a
+request runs inside ``QueryStatsMiddleware`` every statement is counted and
+timed. The middleware then:
+
+- adds a ``Server-Timing: db;dur=...;desc="N queries"`` header (local mode),
+- warns about probable N+1 patterns: the same SQL text executed at least
+  ``n_plus_one_threshold`` times in one request.
+
+Independently of requests, statements slower than ``slow_seconds`` are
+logged with their bound parameters redacted to types, so no user data
+reaches the logs.
+"""
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_request_stats: ContextVar[QueryStats | None] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _request_stats.get()
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """Replace bound values with their type names."""
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, list | tuple):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def instrument_queries(engine: AsyncEngine, slow_seconds: float | None) -> AsyncEngine:
+    """Time every statement on `engine`, feeding request stats and the slow-query log."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        # On the per-statement context, so a statement that raises (and never
+        # reaches after_cursor_execute) leaves nothing behind on the connection
+        if context is not None:
+            context._query_started = time.perf_counter()  # type: ignore[attr-defined]
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        started: float | None = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if slow_seconds is not None and elapsed > slow_seconds:
+            logger.warning(
+                "Slow query (%.3fs): %s parameters=%s",
+                elapsed,
+                statement,
+                redact_parameters(parameters, executemany),
+            )
+
+    return engine
+
+
+class QueryStatsMiddleware:
+    def __init__(
+        self, app: ASGIApp, server_timing: bool = False, n_plus_one_threshold: int = 5
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.server_timing:
+                MutableHeaders(raw=message["headers"]).append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            for statement, times in stats.repeated(self.n_plus_one_threshold):
+                logger.warning(
+                    "Probable N+1: %d identical statements in %s %s: %s",
+                    times,
+                    scope["method"],
+                    scope["path"],
+                    statement,
+                )
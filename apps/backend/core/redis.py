@@ -0,0 +1,168 @@
+"""Shared Redis clients with bounded, instrumented connection pools.
+
+Every Redis user (caches, auth tokens, health checks) goes through one of
+two cached clients per process, mirroring the engine factories in
+``core.database``:
+
+- ``get_redis()`` returns raw ``bytes`` (cache payloads, pub/sub),
+- ``get_text_redis()`` decodes responses to ``str`` (auth token lookups).
+
+Each client has its own ``BlockingConnectionPool`` of at most
+``REDIS_MAX_CONNECTIONS``. A command that finds the pool exhausted waits
+up to ``REDIS_POOL_TIMEOUT`` for a connection instead of opening another
+one. Pool waits are recorded like SQLAlchemy checkouts (see
+``core.pools.PoolStats``). Command and pipeline round trips are timed
+into a latency histogram. Both are served by ``/internal/redis``. Clients
+are closed in the application lifespan.
+"""
+
+import asyncio
+import bisect
+import time
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError, RedisError
+
+from core.config import settings
+from core.pools import PoolStats
+
+# Upper bounds (seconds) of the command-latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1, 0.5)
+
+
+@dataclass
+class CommandStats:
+    commands: int = 0
+    errors: int = 0
+    seconds_total: float = 0.0
+    seconds_max: float = 0.0
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def observe(self, elapsed: float, failed: bool = False) -> None:
+        self.commands += 1
+        self.errors += failed
+        self.seconds_total += elapsed
+        self.seconds_max = max(self.seconds_max, elapsed)
+        self.latency_buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"le_{bound:g}" for bound in LATENCY_BUCKETS] + ["le_inf"]
+        return {
+            "commands": self.commands,
+            "errors": self.errors,
+            "seconds_total": round(self.seconds_total, 6),
+            "seconds_max": round(self.seconds_max, 6),
+            "latency_histogram": dict(zip(labels, self.latency_buckets, strict=True)),
+        }
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    def __init__(self, name: str, warn_wait_seconds: float | None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.wait_stats = PoolStats(name=name, warn_wait_seconds=warn_wait_seconds)
+        self.command_stats = CommandStats()
+
+    async def get_connection(self, *args: Any, **kwargs: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)  # type: ignore[no-untyped-call]
+        except ConnectionError as exc:
+            if isinstance(exc.__cause__, asyncio.TimeoutError):
+                self.wait_stats.observe(time.perf_counter() - started, timed_out=True)
+            raise
+        self.wait_stats.observe(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        stats: CommandStats = self.connection_pool.command_stats  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        try:
+            result = await super().execute(raise_on_error)
+        except RedisError:
+            stats.observe(time.perf_counter() - started, failed=True)
+            raise
+        stats.observe(time.perf_counter() - started)
+        return result
+
+
+class InstrumentedRedis(Redis):
+    """Times each command (including any pool wait) and pipeline round trip."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        stats: CommandStats = self.connection_pool.command_stats  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        try:
+            result = await super().execute_command(*args, **options)  # type: ignore[no-untyped-call]
+        except RedisError:
+            stats.observe(time.perf_counter() - started, failed=True)
+            raise
+        stats.observe(time.perf_counter() - started)
+        return result
+
+    def pipeline(self, transaction: bool = True, shard_hint: Any = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+# ---------------------------------------------------------------------------
+# Client factories (cached singletons)
+# ---------------------------------------------------------------------------
+
+
+def _create_client(name: str, decode_responses: bool) -> InstrumentedRedis:
+    pool = InstrumentedConnectionPool.from_url(
+        settings.REDIS_URL,
+        name=name,
+        warn_wait_seconds=settings.REDIS_POOL_WAIT_WARNING_SECONDS,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        socket_keepalive=settings.REDIS_SOCKET_KEEPALIVE,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        decode_responses=decode_responses,
+    )
+    return InstrumentedRedis(connection_pool=pool)
+
+
+@cache
+def get_redis() -> InstrumentedRedis:
+    return _create_client("redis", decode_responses=False)
+
+
+@cache
+def get_text_redis() -> InstrumentedRedis:
+    return _create_client("redis_text", decode_responses=True)
+
+
+def redis_status(client: Redis) -> dict[str, Any]:
+    """Live occupancy of `client`'s pool plus its accumulated wait and command stats."""
+    pool = client.connection_pool
+    status: dict[str, Any] = {
+        "max_connections": pool.max_connections,
+        "in_use": len(pool._in_use_connections),
+        "idle": len(pool._available_connections),
+    }
+    if isinstance(pool, InstrumentedConnectionPool):
+        status["timeout_seconds"] = pool.timeout
+        status |= pool.wait_stats.as_dict()
+        status["command_stats"] = pool.command_stats.as_dict()
+    return status
+
+
+def redis_statuses() -> dict[str, dict[str, Any]]:
+    return {"redis": redis_status(get_redis()), "redis_text": redis_status(get_text_redis())}
+
+
+async def close_redis() -> None:
+    for factory in (get_redis, get_text_redis):
+        if factory.cache_info().currsize:
+            await factory().aclose(close_connection_pool=True)
+            factory.cache_clear()
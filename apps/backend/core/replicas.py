@@ -0,0 +1,129 @@
+"""Read-replica selection and read-your-writes stickiness.
+
+``ReplicaSet`` picks a replica engine for each read-only session, either
+round-robin or by fewest checked-out connections. A replica that fails to
+hand out a connection is ejected for ``eject_seconds`` and then tried again.
+When no replica is available, reads fall back to the primary.
+
+Replicas lag the primary, so a client that just wrote should not read from
+them. ``ReadYourWritesMiddleware`` sets a short-lived cookie on any response
+whose request wrote to the primary (see ``record_write``). While the cookie
+is present, ``prefers_primary`` routes that client's reads to the primary.
+"""
+
+import itertools
+import logging
+import math
+import time
+from collections.abc import Sequence
+from contextvars import ContextVar
+from typing import Literal
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+ReplicaSelection = Literal["round_robin", "least_connections"]
+
+READ_PRIMARY_COOKIE = "read_primary"
+
+# session.info flag set on sessions bound to a replica
+REPLICA_SESSION = "replica"
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        selection: ReplicaSelection = "round_robin",
+        eject_seconds: float = 30.0,
+    ) -> None:
+        self.engines = list(engines)
+        self.selection = selection
+        self.eject_seconds = eject_seconds
+        self._ejected_until: dict[int, float] = {}
+        self._counter = itertools.count()
+
+    def healthy(self) -> list[AsyncEngine]:
+        now = time.monotonic()
+        return [
+            engine
+            for index, engine in enumerate(self.engines)
+            if self._ejected_until.get(index, 0.0) <= now
+        ]
+
+    def candidates(self) -> list[AsyncEngine]:
+        """Healthy replicas, best choice first."""
+        healthy = self.healthy()
+        if not healthy:
+            return []
+        if self.selection == "least_connections":
+            return sorted(healthy, key=lambda engine: engine.pool.checkedout())  # type: ignore[attr-defined]
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def eject(self, engine: AsyncEngine) -> None:
+        index = self.engines.index(engine)
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.warning(
+            "Ejected read replica %s for %.0fs",
+            engine.url.render_as_string(hide_password=True),
+            self.eject_seconds,
+        )
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    return bool(session.info.get(REPLICA_SESSION))
+
+
+# ---------------------------------------------------------------------------
+# Read-your-writes
+# ---------------------------------------------------------------------------
+
+_request_writes: ContextVar[list[bool] | None] = ContextVar("request_writes", default=None)
+
+
+def record_write() -> None:
+    """Note that the current request wrote to the primary."""
+    marker = _request_writes.get()
+    if marker is not None and not marker:
+        marker.append(True)
+
+
+def prefers_primary(connection: HTTPConnection) -> bool:
+    return READ_PRIMARY_COOKIE in connection.cookies
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, window_seconds: float) -> None:
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.window_seconds <= 0:
+            await self.app(scope, receive, send)
+            return
+        # A mutable marker, so writes recorded in copied contexts are still seen here
+        marker: list[bool] = []
+        token = _request_writes.set(marker)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker:
+                MutableHeaders(raw=message["headers"]).append(
+                    "Set-Cookie",
+                    f"{READ_PRIMARY_COOKIE}=1; Max-Age={math.ceil(self.window_seconds)}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _request_writes.reset(token)
@@ -0,0 +1,98 @@
+"""Fast JSON responses.
+
+``ORJSONResponse`` is the application's default response class, used for
+routes that return plain dicts/lists without a ``response_model``. Routes
+with a ``response_model`` keep FastAPI's Pydantic ``dump_json`` path.
+
+For large lists of ORM rows, ``rows_response`` skips Pydantic entirely: the
+rows come from our own tables, so they are already valid for their read
+schema, and only the schema's field names are needed to serialize them::
+
+    @router.get("/", response_model=list[ItemRead])
+    async def list_items(session: AppDbSessionDep) -> Response:
+        items = (await session.scalars(select(Item))).all()
+        return rows_response(ItemRead, items)
+
+The output is byte-compatible with ``TypeAdapter(list[schema]).dump_json``
+for schemas made of plain fields (no aliases, serializers or computed
+fields), which is checked when the schema is first used.
+"""
+
+import uuid
+from collections.abc import Mapping, Sequence
+from functools import cache
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+# Pydantic renders UTC datetimes with a trailing "Z"
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # orjson only handles exact uuid.UUID; asyncpg returns a subclass
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@cache
+def _plain_fields(schema: type[BaseModel]) -> tuple[str, ...]:
+    decorators = schema.__pydantic_decorators__
+    aliased = [name for name, info in schema.model_fields.items() if info.alias not in (None, name)]
+    if aliased or decorators.field_serializers or decorators.model_serializers:
+        raise TypeError(f"{schema.__name__} customizes serialization; use response_model instead")
+    if schema.model_computed_fields:
+        raise TypeError(f"{schema.__name__} has computed fields; use response_model instead")
+    return tuple(schema.model_fields)
+
+
+def dump_rows(
+    schema: type[BaseModel], rows: Sequence[Any], fields: Sequence[str] | None = None
+) -> bytes:
+    """Serialize `rows` as a JSON array of `schema` objects without validating them.
+
+    `rows` may be ORM instances or result rows exposing each field as an
+    attribute. `fields` restricts the output to a subset, in the given order.
+    """
+    names = _plain_fields(schema)
+    if fields is not None:
+        names = tuple(fields)
+    return orjson.dumps(
+        [{name: getattr(row, name) for name in names} for row in rows],
+        default=_default,
+        option=ORJSON_OPTIONS,
+    )
+
+
+def rows_response(
+    schema: type[BaseModel],
+    rows: Sequence[Any],
+    fields: Sequence[str] | None = None,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+    background: BackgroundTask | None = None,
+) -> Response:
+    """A JSON response of trusted `rows` shaped like ``list[schema]``; see `dump_rows`."""
+    return Response(
+        dump_rows(schema, rows, fields),
+        status_code,
+        headers,
+        media_type="application/json",
+        background=background,
+    )
@@ -1,10 +1,39 @@
-from sqlalchemy import Column, String, Text
+from sqlalchemy import Column, Computed, Index, String, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
 from core.schemas.base import AppDBModel
 
+ITEM_SEARCH_CONFIG = "english"
+
 
 class Item(AppDBModel):
     __tablename__ = "item"
+    __table_args__ = (
+        # Backs keyset pagination ordered by (created_at, id)
+        Index("ix_item_created_at_id", "created_at", "id"),
+        # Full-text search over title + description
+        Index("ix_item_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram prefix/substring matching on title (requires the pg_trgm extension)
+        Index(
+            "ix_item_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
+
+    # Generated by Postgres; deferred so regular reads never load it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{ITEM_SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{ITEM_SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
@@ -0,0 +1,120 @@
+"""Write-behind buffering of single-row inserts.
+
+High-rate create endpoints otherwise pay one transaction per request.
+A ``WriteBehindBuffer`` collects rows from concurrent callers and writes
+them as one multi-row ``INSERT ... RETURNING`` and one commit, as soon as
+``max_rows`` rows are pending or ``max_delay_seconds`` after the first
+pending row, whichever comes first::
+
+    event_buffer = WriteBehindBuffer(Event)
+
+    @router.post("/events", status_code=201)
+    async def create_event(payload: EventCreate) -> EventRead:
+        event = await event_buffer.insert(payload.model_dump())
+        return EventRead.model_validate(event)
+
+``insert`` resolves once the caller's batch commits, so a 201 still means
+the row is durable. A failed batch raises its error in every caller of that
+batch. A caller that is cancelled while waiting does not withdraw its row.
+
+Buffers are flushed by ``flush_write_behind_buffers`` in the application
+lifespan so no accepted row is lost on shutdown.
+"""
+
+import asyncio
+import logging
+import weakref
+from collections.abc import Mapping
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.config import settings
+from core.database import bulk_insert_returning, get_app_db_session_maker
+from core.replicas import record_write
+from core.schemas.base import AppDBModel
+
+logger = logging.getLogger(__name__)
+
+_buffers: weakref.WeakSet["WriteBehindBuffer[Any]"] = weakref.WeakSet()
+
+
+class WriteBehindBuffer[ModelT: AppDBModel]:
+    def __init__(
+        self,
+        model: type[ModelT],
+        max_rows: int | None = None,
+        max_delay_seconds: float | None = None,
+        session_maker: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self.model = model
+        self.max_rows = max_rows or settings.WRITE_BEHIND_MAX_ROWS
+        self.max_delay_seconds = max_delay_seconds or settings.WRITE_BEHIND_MAX_DELAY_MS / 1000
+        self.session_maker = session_maker
+        self._pending: list[tuple[dict[str, Any], asyncio.Future[ModelT]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._writes: set[asyncio.Task[None]] = set()
+        _buffers.add(self)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def insert(self, values: Mapping[str, Any]) -> ModelT:
+        """Queue one row and return it as inserted once its batch commits."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[ModelT] = loop.create_future()
+        self._pending.append((dict(values), future))
+        if len(self._pending) >= self.max_rows:
+            self._start_write()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay_seconds, self._start_write)
+        row = await future
+        # The batch is written from its own task, outside this request's context
+        record_write()
+        return row
+
+    async def flush(self) -> None:
+        """Write everything pending now and wait for all in-flight batches."""
+        if self._pending:
+            self._start_write()
+        while self._writes:
+            await asyncio.gather(*self._writes)
+
+    def _start_write(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._write(batch))
+            self._writes.add(task)
+            task.add_done_callback(self._writes.discard)
+
+    async def _write(self, batch: list[tuple[dict[str, Any], asyncio.Future[ModelT]]]) -> None:
+        session_maker = self.session_maker or get_app_db_session_maker()
+        try:
+            async with session_maker() as session:
+                rows = await bulk_insert_returning(
+                    session, self.model, [values for values, _ in batch]
+                )
+                await session.commit()
+        except Exception as exc:
+            logger.warning(
+                "Write-behind batch of %d %s rows failed",
+                len(batch),
+                self.model.__tablename__,
+                exc_info=True,
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), row in zip(batch, rows, strict=True):
+            if not future.done():
+                future.set_result(row)
+
+
+async def flush_write_behind_buffers() -> None:
+    """Flush every live buffer; called from the application lifespan on shutdown."""
+    for buffer in list(_buffers):
+        await buffer.flush()
@@ -3,11 +3,24 @@
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import MetaData, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
 
 from app.main import app
 from core.config import settings
-from core.database import get_app_db_session, get_users_db_session
+from core.database import (
+    AppDbSession,
+    get_app_db_read_session,
+    get_app_db_session,
+    get_users_db_session,
+)
 from core.schemas.base import AppDBModel, UserManagementDBModel
 
 # ---------------------------------------------------------------------------
@@ -17,12 +30,12 @@
 
 @pytest.fixture(scope="session")
 def app_db_engine():
-    return create_async_engine(settings.APP_DB_URL, echo=False)
+    return create_async_engine(settings.APP_DB_URL, echo=False, poolclass=NullPool)
 
 
 @pytest.fixture(scope="session")
 def users_db_engine():
-    return create_async_engine(settings.USERS_DB_URL, echo=False)
+    return create_async_engine(settings.USERS_DB_URL, echo=False, poolclass=NullPool)
 
 
 # ---------------------------------------------------------------------------
@@ -30,46 +43,64 @@ def users_db_engine():
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture
-async def app_db_session(app_db_engine) -> AsyncGenerator[AsyncSession, None]:
+async def _isolated_session(
+    engine: AsyncEngine,
+    metadata: MetaData,
+    extensions: tuple[str, ...] = (),
+    sync_session_class: type[Session] = Session,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session bound to a throwaway schema that is dropped afterwards.
+
+    The schema is pinned through the connection's ``search_path`` server
+    setting so it survives commits and pool checkouts. `extensions` are
+    installed once into ``public``, which stays on the path.
+    """
     schema_name = f"test_{uuid.uuid4().hex[:8]}"
-    async with app_db_engine.connect() as conn:
-        await conn.execute(type(conn).text(f'CREATE SCHEMA "{schema_name}"'))
-        await conn.execute(type(conn).text(f'SET search_path TO "{schema_name}"'))
-        await conn.run_sync(AppDBModel.metadata.create_all)
+    async with engine.connect() as conn:
+        for extension in extensions:
+            await conn.execute(text(f'CREATE EXTENSION IF NOT EXISTS "{extension}" SCHEMA public'))
+        await conn.execute(text(f'CREATE SCHEMA "{schema_name}"'))
         await conn.commit()
 
+    schema_engine = create_async_engine(
+        engine.url,
+        echo=False,
+        connect_args={"server_settings": {"search_path": f'"{schema_name}", public'}},
+    )
+    async with schema_engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+
     session_maker = async_sessionmaker(
-        bind=app_db_engine, class_=AsyncSession, expire_on_commit=False
+        bind=schema_engine,
+        class_=AsyncSession,
+        sync_session_class=sync_session_class,
+        expire_on_commit=False,
     )
     async with session_maker() as session:
-        await session.execute(type(session).text(f'SET search_path TO "{schema_name}"'))
         yield session
+    await schema_engine.dispose()
 
-    async with app_db_engine.connect() as conn:
-        await conn.execute(type(conn).text(f'DROP SCHEMA "{schema_name}" CASCADE'))
+    async with engine.connect() as conn:
+        await conn.execute(text(f'DROP SCHEMA "{schema_name}" CASCADE'))
         await conn.commit()
 
 
 @pytest.fixture
-async def users_db_session(users_db_engine) -> AsyncGenerator[AsyncSession, None]:
-    schema_name = f"test_{uuid.uuid4().hex[:8]}"
-    async with users_db_engine.connect() as conn:
-        await conn.execute(type(conn).text(f'CREATE SCHEMA "{schema_name}"'))
-        await conn.execute(type(conn).text(f'SET search_path TO "{schema_name}"'))
-        await conn.run_sync(UserManagementDBModel.metadata.create_all)
-        await conn.commit()
-
-    session_maker = async_sessionmaker(
-        bind=users_db_engine, class_=AsyncSession, expire_on_commit=False
-    )
-    async with session_maker() as session:
-        await session.execute(type(session).text(f'SET search_path TO "{schema_name}"'))
+async def app_db_session(app_db_engine) -> AsyncGenerator[AsyncSession, None]:
+    # The app's session class, so routes under test run its write hooks
+    async for session in _isolated_session(
+        app_db_engine,
+        AppDBModel.metadata,
+        extensions=("pg_trgm",),
+        sync_session_class=AppDbSession,
+    ):
         yield session
 
-    async with users_db_engine.connect() as conn:
-        await conn.execute(type(conn).text(f'DROP SCHEMA "{schema_name}" CASCADE'))
-        await conn.commit()
+
+@pytest.fixture
+async def users_db_session(users_db_engine) -> AsyncGenerator[AsyncSession, None]:
+    async for session in _isolated_session(users_db_engine, UserManagementDBModel.metadata):
+        yield session
 
 
 # ---------------------------------------------------------------------------
@@ -86,6 +117,7 @@ async def override_users_db():
         yield users_db_session
 
     app.dependency_overrides[get_app_db_session] = override_app_db
+    app.dependency_overrides[get_app_db_read_session] = override_app_db
     app.dependency_overrides[get_users_db_session] = override_users_db
 
     async with AsyncClient(
@@ -109,7 +141,7 @@ def clear_caches():
     for obj in [
         *[
             getattr(mod, name)
-            for mod_name in ["core.database"]
+            for mod_name in ["core.database", "core.cache", "core.redis", "app.dependencies.auth"]
             for mod in [__import__(mod_name, fromlist=[""])]
             for name in dir(mod)
             if callable(getattr(mod, name)) and hasattr(getattr(mod, name), "cache_clear")
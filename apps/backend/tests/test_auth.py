@@ -0,0 +1,46 @@
+import pytest
+from fastapi_users.db import SQLAlchemyUserDatabase
+
+from app.auth.user_manager import UserManager
+from app.dependencies.auth import get_redis_strategy
+from app.models.user import UserUpdate
+from core.schemas.users import OAuthAccount, User
+
+
+async def _superuser(users_db_session) -> tuple[User, dict[str, str]]:
+    user = User(email="admin@example.com", hashed_password="x", is_superuser=True)
+    users_db_session.add(user)
+    await users_db_session.commit()
+    token = await get_redis_strategy().write_token(user)
+    return user, {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_missing_or_unknown_token_is_unauthorized(client) -> None:
+    assert (await client.get("/internal/pools")).status_code == 401
+    headers = {"Authorization": "Bearer not-a-token"}
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_by_user_manager(client, users_db_session) -> None:
+    user, headers = await _superuser(users_db_session)
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 200
+
+    # Changed behind the manager's back: the cached flags still apply
+    user.is_superuser = False
+    await users_db_session.commit()
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 200
+
+    manager = UserManager(SQLAlchemyUserDatabase(users_db_session, User, OAuthAccount))
+    await manager.update(UserUpdate(is_superuser=False), user, safe=False)
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_logout_takes_effect_despite_cached_user(client, users_db_session) -> None:
+    user, headers = await _superuser(users_db_session)
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 200
+
+    await get_redis_strategy().destroy_token(headers["Authorization"].split()[1], user)
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 401
@@ -0,0 +1,116 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.models.item import ItemRead
+from core.cache import (
+    CacheInvalidationSubscriber,
+    LocalLRUCache,
+    ReadThroughCache,
+    get_local_cache,
+)
+from core.redis import get_redis
+from core.schemas.item import Item
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_populates_and_invalidates() -> None:
+    cache = ReadThroughCache(Item, ItemRead, ttl_seconds=30)
+    item_id = uuid.uuid4()
+    calls = 0
+
+    async def loader() -> ItemRead:
+        nonlocal calls
+        calls += 1
+        return ItemRead(
+            id=item_id,
+            title="cached",
+            description=None,
+            created_at="2024-01-01T00:00:00Z",
+            updated_at="2024-01-01T00:00:00Z",
+        )
+
+    first = await cache.get_or_load(item_id, loader)
+    second = await cache.get_or_load(item_id, loader)
+    assert first == second
+    assert calls == 1
+
+    await cache.invalidate(item_id)
+    await cache.get_or_load(item_id, loader)
+    assert calls == 2
+    await cache.invalidate(item_id)
+
+
+@pytest.mark.asyncio
+async def test_item_read_is_invalidated_by_update(client) -> None:
+    item = (await client.post("/v1/items/", json={"title": "before"})).json()
+    assert (await client.get(f"/v1/items/{item['id']}")).json()["title"] == "before"
+
+    await client.patch(f"/v1/items/{item['id']}", json={"title": "after"})
+    assert (await client.get(f"/v1/items/{item['id']}")).json()["title"] == "after"
+
+    await client.delete(f"/v1/items/{item['id']}")
+    assert (await client.get(f"/v1/items/{item['id']}")).status_code == 404
+
+
+def test_local_lru_evicts_least_recently_used() -> None:
+    local = LocalLRUCache(max_entries=2, ttl_seconds=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    assert local.get("a") == 1
+    local.set("c", 3)
+
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+    assert local.stats.evictions == 1
+    assert local.stats.local_hits == 3
+    assert local.stats.local_misses == 1
+
+
+def test_local_lru_expires_entries() -> None:
+    local = LocalLRUCache(max_entries=10, ttl_seconds=0)
+    local.set("a", 1)
+    assert local.get("a") is None
+    assert local.stats.expirations == 1
+    assert len(local) == 0
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_broadcast_to_local_tier() -> None:
+    subscriber = CacheInvalidationSubscriber(channel="cache:invalidate:test")
+    await subscriber.start()
+    try:
+        local = get_local_cache()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            local.set("cache:item:probe", "stale")
+            await get_redis().publish("cache:invalidate:test", "cache:item:probe")
+            await asyncio.sleep(0.01)
+            if local.get("cache:item:probe") is None:
+                break
+        else:
+            pytest.fail("local entry was never invalidated")
+    finally:
+        await subscriber.stop()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_survives_undecodable_messages() -> None:
+    subscriber = CacheInvalidationSubscriber(channel="cache:invalidate:test", retry_seconds=0.01)
+    await subscriber.start()
+    try:
+        local = get_local_cache()
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            await get_redis().publish("cache:invalidate:test", b"\xff")
+            local.set("cache:item:probe", "stale")
+            await get_redis().publish("cache:invalidate:test", "cache:item:probe")
+            await asyncio.sleep(0.02)
+            if local.get("cache:item:probe") is None:
+                break
+        else:
+            pytest.fail("subscriber stopped after an undecodable message")
+    finally:
+        await subscriber.stop()
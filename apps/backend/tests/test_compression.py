@@ -0,0 +1,100 @@
+import gzip
+import zlib
+
+import brotli
+import pytest
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.types import Message
+
+from core.compression import CompressionMiddleware, negotiate_encoding
+
+
+async def _call(app, accept_encoding: str) -> list[Message]:
+    middleware = CompressionMiddleware(
+        app, minimum_size=100, media_types=["application/json", "application/x-ndjson"]
+    )
+    scope = {
+        "type": "http",
+        "asgi": {"spec_version": "2.4"},
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def _headers(start: Message) -> dict[str, str]:
+    return {key.decode(): value.decode() for key, value in start["headers"]}
+
+
+def test_negotiate_encoding() -> None:
+    assert negotiate_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("br;q=0, *", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("identity", ["br", "gzip"]) is None
+    assert negotiate_encoding("br", ["gzip"]) is None
+
+
+@pytest.mark.asyncio
+async def test_compresses_allowed_media_type_over_threshold() -> None:
+    body = b"[" + b",".join(b'{"title":"item"}' for _ in range(50)) + b"]"
+    start, message = await _call(Response(body, media_type="application/json"), "gzip")
+    headers = _headers(start)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(message["body"]) < len(body)
+    assert gzip.decompress(message["body"]) == body
+
+
+@pytest.mark.asyncio
+async def test_skips_small_and_unlisted_responses() -> None:
+    start, message = await _call(Response(b"{}", media_type="application/json"), "br")
+    assert "content-encoding" not in _headers(start)
+    assert message["body"] == b"{}"
+
+    start, message = await _call(PlainTextResponse("x" * 1000), "br")
+    assert "content-encoding" not in _headers(start)
+    assert message["body"] == b"x" * 1000
+
+
+@pytest.mark.asyncio
+async def test_streams_incrementally() -> None:
+    lines = [b'{"n":%d}\n' % n for n in range(3)]
+
+    async def chunks():
+        for line in lines:
+            yield line
+
+    app = StreamingResponse(chunks(), media_type="application/x-ndjson")
+    start, *bodies = await _call(app, "br")
+    assert _headers(start)["content-encoding"] == "br"
+    assert "content-length" not in _headers(start)
+
+    # Every chunk is flushed, so each line is decodable as soon as it arrives
+    decoder = brotli.Decompressor()
+    for line, message in zip(lines, bodies, strict=False):
+        assert decoder.process(message["body"]) == line
+    assert bodies[-1]["more_body"] is False
+
+
+@pytest.mark.asyncio
+async def test_gzip_stream_round_trips() -> None:
+    async def chunks():
+        yield b'{"n":1}\n'
+        yield b'{"n":2}\n'
+
+    app = StreamingResponse(chunks(), media_type="application/x-ndjson")
+    _, *bodies = await _call(app, "gzip")
+    decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    assert decoder.decompress(b"".join(message["body"] for message in bodies)) == (
+        b'{"n":1}\n{"n":2}\n'
+    )
@@ -0,0 +1,69 @@
+from collections.abc import AsyncIterator
+
+import msgpack
+import pytest
+
+from app.main import app
+from core.config import settings
+from core.content_negotiation import MSGPACK_MEDIA_TYPE, prefers_msgpack
+
+MSGPACK_HEADERS = {"Accept": MSGPACK_MEDIA_TYPE, "Content-Type": MSGPACK_MEDIA_TYPE}
+
+
+def test_prefers_msgpack() -> None:
+    assert prefers_msgpack("application/msgpack")
+    assert prefers_msgpack("application/msgpack, application/json")
+    assert not prefers_msgpack("application/json, application/msgpack;q=0.5")
+    assert not prefers_msgpack("*/*")
+    assert not prefers_msgpack("")
+
+
+@pytest.mark.asyncio
+async def test_msgpack_request_and_response(client) -> None:
+    response = await client.post(
+        "/v1/items/", content=msgpack.packb({"title": "packed"}), headers=MSGPACK_HEADERS
+    )
+    assert response.status_code == 201
+    assert response.headers["content-type"] == MSGPACK_MEDIA_TYPE
+    created = msgpack.unpackb(response.content)
+    assert created["title"] == "packed"
+
+    response = await client.get("/v1/items/", headers={"Accept": MSGPACK_MEDIA_TYPE})
+    assert msgpack.unpackb(response.content) == [created]
+    assert "Accept" in response.headers["vary"]
+
+    response = await client.get("/v1/items/")
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == [created]
+
+
+@pytest.mark.asyncio
+async def test_msgpack_errors(client) -> None:
+    response = await client.post("/v1/items/", content=b"\xc1", headers=MSGPACK_HEADERS)
+    assert response.status_code == 400
+
+    response = await client.post("/v1/items/", content=msgpack.packb({}), headers=MSGPACK_HEADERS)
+    assert response.status_code == 422
+    assert msgpack.unpackb(response.content)["detail"][0]["loc"] == ["body", "title"]
+
+
+@pytest.mark.asyncio
+async def test_msgpack_body_size_is_capped(client) -> None:
+    oversized = msgpack.packb({"title": "x" * settings.MSGPACK_MAX_BODY_SIZE})
+    response = await client.post("/v1/items/", content=oversized, headers=MSGPACK_HEADERS)
+    assert response.status_code == 413
+
+    async def chunked() -> AsyncIterator[bytes]:
+        for start in range(0, len(oversized), 65536):
+            yield oversized[start : start + 65536]
+
+    response = await client.post("/v1/items/", content=chunked(), headers=MSGPACK_HEADERS)
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+
+
+def test_openapi_documents_msgpack() -> None:
+    operation = app.openapi()["paths"]["/v1/items/"]["post"]
+    assert MSGPACK_MEDIA_TYPE in operation["requestBody"]["content"]
+    assert MSGPACK_MEDIA_TYPE in operation["responses"]["201"]["content"]
+    assert MSGPACK_MEDIA_TYPE not in str(app.openapi()["paths"]["/health"])
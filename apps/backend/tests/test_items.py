@@ -0,0 +1,372 @@
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import func, update
+
+from core.bulk_load import iter_records
+from core.config import settings
+from core.exceptions import ValidationError
+from core.pagination import decode_cursor, encode_cursor
+from core.schemas.item import Item
+
+
+async def _create_items(client, count: int) -> list[dict]:
+    items = []
+    for i in range(count):
+        response = await client.post("/v1/items/", json={"title": f"item {i}"})
+        assert response.status_code == 201
+        items.append(response.json())
+    return items
+
+
+def test_cursor_round_trip() -> None:
+    token = encode_cursor("2024-01-01T00:00:00+00:00", 42)
+    assert decode_cursor(token, str, int) == ("2024-01-01T00:00:00+00:00", 42)
+
+
+def test_malformed_cursor_is_rejected() -> None:
+    with pytest.raises(ValidationError):
+        decode_cursor("not-a-cursor", str, int)
+
+
+@pytest.mark.asyncio
+async def test_list_items_keyset_pagination(client) -> None:
+    created = await _create_items(client, 5)
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = await client.get("/v1/items/", params=params)
+        assert response.status_code == 200
+        seen.extend(item["id"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert seen == [item["id"] for item in created]
+
+
+@pytest.mark.asyncio
+async def test_list_items_matches_response_model_bytes(client) -> None:
+    created = await _create_items(client, 2)
+    response = await client.get("/v1/items/")
+    singles = [(await client.get(f"/v1/items/{item['id']}")).content for item in created]
+    assert response.content == b"[" + b",".join(singles) + b"]"
+
+
+@pytest.mark.asyncio
+async def test_list_items_db_json_rendering(client, app_db_session, monkeypatch) -> None:
+    for title, description in [('quote " back\\ tab\t', None), ("é \u2028 \x01", "line\nbreak")]:
+        await client.post("/v1/items/", json={"title": title, "description": description})
+    # Whole-second timestamps omit the fractional part
+    await app_db_session.execute(
+        update(Item).values(created_at=func.date_trunc("second", Item.created_at))
+    )
+    await app_db_session.commit()
+
+    for params in [{}, {"fields": "title,created_at"}, {"limit": 1}]:
+        expected = await client.get("/v1/items/", params=params)
+        monkeypatch.setattr(settings, "DB_JSON_RENDERING", True)
+        rendered = await client.get("/v1/items/", params=params)
+        monkeypatch.setattr(settings, "DB_JSON_RENDERING", False)
+        assert rendered.content == expected.content
+        assert rendered.headers["ETag"] == expected.headers["ETag"]
+        assert rendered.headers.get("X-Next-Cursor") == expected.headers.get("X-Next-Cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_items_legacy_offset(client) -> None:
+    created = await _create_items(client, 3)
+    response = await client.get("/v1/items/", params={"limit": 2, "offset": 1})
+    assert [item["id"] for item in response.json()] == [item["id"] for item in created[1:3]]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_list_items_invalid_cursor(client) -> None:
+    response = await client.get("/v1/items/", params={"cursor": "garbage"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_items(client) -> None:
+    payload = [{"title": "a"}, {"title": "b", "description": "second"}]
+    response = await client.post("/v1/items/bulk", json=payload)
+    assert response.status_code == 201
+    results = response.json()
+    assert [r["index"] for r in results] == [0, 1]
+    assert [r["status"] for r in results] == ["created", "created"]
+    assert [r["item"]["title"] for r in results] == ["a", "b"]
+    assert results[1]["item"]["description"] == "second"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_items(client) -> None:
+    first, second = await _create_items(client, 2)
+    missing = str(uuid.uuid4())
+    payload = [
+        {"id": first["id"], "title": "renamed"},
+        {"id": missing, "title": "ghost"},
+        {"id": second["id"], "description": "added"},
+    ]
+    response = await client.patch("/v1/items/bulk", json=payload)
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == ["updated", "not_found", "updated"]
+    assert results[0]["item"]["title"] == "renamed"
+    assert results[0]["item"]["description"] is None
+    assert results[2]["item"]["title"] == second["title"]
+    assert results[2]["item"]["description"] == "added"
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_duplicate_ids(client) -> None:
+    (item,) = await _create_items(client, 1)
+    payload = [{"id": item["id"], "title": "x"}, {"id": item["id"], "title": "y"}]
+    response = await client.patch("/v1/items/bulk", json=payload)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_items(client) -> None:
+    first, second = await _create_items(client, 2)
+    missing = str(uuid.uuid4())
+    response = await client.request(
+        "DELETE", "/v1/items/bulk", json=[first["id"], missing, second["id"]]
+    )
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()] == ["deleted", "not_found", "deleted"]
+    assert (await client.get(f"/v1/items/{first['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_item_returns_updated_row(client) -> None:
+    (item,) = await _create_items(client, 1)
+    response = await client.patch(f"/v1/items/{item['id']}", json={"description": "patched"})
+    assert response.status_code == 200
+    assert response.json()["title"] == item["title"]
+    assert response.json()["description"] == "patched"
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_missing_item(client) -> None:
+    missing = uuid.uuid4()
+    assert (await client.patch(f"/v1/items/{missing}", json={"title": "x"})).status_code == 404
+    assert (await client.delete(f"/v1/items/{missing}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_item(client) -> None:
+    (item,) = await _create_items(client, 1)
+    assert (await client.delete(f"/v1/items/{item['id']}")).status_code == 204
+    assert (await client.get(f"/v1/items/{item['id']}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_item_conditional(client) -> None:
+    (item,) = await _create_items(client, 1)
+    response = await client.get(f"/v1/items/{item['id']}")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = await client.get(f"/v1/items/{item['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+    await client.patch(f"/v1/items/{item['id']}", json={"title": "changed"})
+    response = await client.get(f"/v1/items/{item['id']}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_list_items_conditional(client) -> None:
+    await _create_items(client, 2)
+    etag = (await client.get("/v1/items/")).headers["ETag"]
+    response = await client.get("/v1/items/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    await _create_items(client, 1)
+    response = await client.get("/v1/items/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_update_item_if_match(client) -> None:
+    (item,) = await _create_items(client, 1)
+    etag = (await client.get(f"/v1/items/{item['id']}")).headers["ETag"]
+
+    response = await client.patch(
+        f"/v1/items/{item['id']}", json={"title": "first"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    new_etag = response.headers["ETag"]
+    assert new_etag != etag
+
+    response = await client.patch(
+        f"/v1/items/{item['id']}", json={"title": "stale"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = await client.patch(
+        f"/v1/items/{item['id']}", json={"title": "second"}, headers={"If-Match": new_etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "second"
+
+
+@pytest.mark.asyncio
+async def test_export_items_ndjson(client) -> None:
+    created = await _create_items(client, 3)
+    response = await client.get("/v1/items/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [item["id"] for item in created]
+
+
+@pytest.mark.asyncio
+async def test_export_items_csv_with_range(client) -> None:
+    created = await _create_items(client, 3)
+    response = await client.get(
+        "/v1/items/export",
+        params={"format": "csv", "created_from": created[1]["created_at"]},
+    )
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [item["id"] for item in created[1:]]
+    assert rows[0]["title"] == created[1]["title"]
+
+
+@pytest.mark.asyncio
+async def test_import_items_ndjson(client, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "IMPORT_BATCH_ROWS", 1)
+    body = b'{"title": "one"}\n{"description": "no title"}\nnot json\n{"title": "two"}\n'
+    response = await client.post(
+        "/v1/items/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["rows_read"] == 4
+    assert summary["rows_loaded"] == 2
+    assert summary["rows_rejected"] == 2
+    assert summary["batches"] == 2
+    assert [error["line"] for error in summary["errors"]] == [2, 3]
+
+    titles = {item["title"] for item in (await client.get("/v1/items/")).json()}
+    assert titles == {"one", "two"}
+
+
+@pytest.mark.asyncio
+async def test_import_items_csv_multiline_field(client) -> None:
+    body = b'title,description\nfirst,"spans\ntwo lines"\nsecond,\n'
+    response = await client.post(
+        "/v1/items/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.json()["rows_loaded"] == 2
+
+    items = (await client.get("/v1/items/")).json()
+    assert {item["title"]: item["description"] for item in items} == {
+        "first": "spans\ntwo lines",
+        "second": "",
+    }
+
+
+@pytest.mark.asyncio
+async def test_import_items_rejects_long_and_undecodable_lines(client, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_BYTES", 64)
+    body = (
+        b'{"title": "one"}\n'
+        + b'{"title": "'
+        + b"x" * 200
+        + b'"}\n'
+        + b'{"title": "caf\xe9"}\n'
+        + b'{"title": "two"}\n'
+    )
+    response = await client.post(
+        "/v1/items/import", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["rows_loaded"] == 2
+    assert [error["line"] for error in summary["errors"]] == [2, 3]
+    assert "exceeds 64 bytes" in summary["errors"][0]["error"]
+    assert "UTF-8" in summary["errors"][1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_iter_records_skips_oversized_csv_record() -> None:
+    async def chunks() -> AsyncIterator[bytes]:
+        # Split mid-line so the limit is enforced across chunk boundaries
+        data = b'title,description\nbig,"' + b"y" * 40 + b"\n" + b"y" * 40 + b'"\nsmall,ok\n'
+        for start in range(0, len(data), 7):
+            yield data[start : start + 7]
+
+    records = [record async for record in iter_records(chunks(), "csv", max_record_bytes=64)]
+    assert records == [
+        (2, "Record exceeds 64 bytes"),
+        (4, {"title": "small", "description": "ok"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_items_fulltext_ranked(client) -> None:
+    payload = [
+        {"title": "Gardening basics", "description": "How to plant tomatoes"},
+        {"title": "Tomato soup", "description": "A recipe"},
+        {"title": "Bicycles", "description": "Nothing relevant"},
+    ]
+    await client.post("/v1/items/bulk", json=payload)
+
+    response = await client.get("/v1/items/search", params={"q": "tomatoes"})
+    assert response.status_code == 200
+    # Title matches are weighted above description matches
+    assert [item["title"] for item in response.json()] == ["Tomato soup", "Gardening basics"]
+
+    first = await client.get("/v1/items/search", params={"q": "tomato", "limit": 1})
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get(
+        "/v1/items/search", params={"q": "tomato", "limit": 1, "cursor": cursor}
+    )
+    assert [item["title"] for item in second.json()] == ["Gardening basics"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_search_items_prefix(client) -> None:
+    payload = [{"title": "Apple pie"}, {"title": "apricot jam"}, {"title": "Banana 50%"}]
+    await client.post("/v1/items/bulk", json=payload)
+
+    response = await client.get("/v1/items/search", params={"q": "ap", "mode": "prefix"})
+    assert sorted(item["title"] for item in response.json()) == ["Apple pie", "apricot jam"]
+
+    response = await client.get("/v1/items/search", params={"q": "%", "mode": "prefix"})
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_list_items_sparse_fields(client) -> None:
+    created = await _create_items(client, 3)
+    response = await client.get("/v1/items/", params={"fields": "title,id", "limit": 2})
+    assert response.status_code == 200
+    assert response.json() == [{"id": item["id"], "title": item["title"]} for item in created[:2]]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = await client.get("/v1/items/", params={"fields": "id", "cursor": cursor})
+    assert response.json() == [{"id": created[2]["id"]}]
+
+    full_etag = (await client.get("/v1/items/")).headers["ETag"]
+    sparse_etag = (await client.get("/v1/items/", params={"fields": "id"})).headers["ETag"]
+    assert full_etag != sparse_etag
+
+
+@pytest.mark.asyncio
+async def test_list_items_unknown_field(client) -> None:
+    response = await client.get("/v1/items/", params={"fields": "id,search_vector"})
+    assert response.status_code == 422
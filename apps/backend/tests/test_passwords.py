@@ -0,0 +1,54 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.auth.passwords import get_password_helper
+from core.executors import BoundedExecutor
+from core.schemas.users import User
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_off_the_event_loop() -> None:
+    helper = get_password_helper()
+    hashed = await helper.hash_async("correct horse")
+    assert hashed.startswith("$argon2id$")
+    assert (await helper.verify_and_update_async("correct horse", hashed))[0]
+    assert not (await helper.verify_and_update_async("wrong", hashed))[0]
+
+
+@pytest.mark.asyncio
+async def test_saturated_executor_fails_fast() -> None:
+    executor = BoundedExecutor("Test pool", workers=1, queue_limit=1)
+    release = threading.Event()
+    try:
+        running = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as exc_info:
+            await executor.run(release.wait)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers == {"Retry-After": "1"}
+
+        release.set()
+        await asyncio.gather(*running)
+        # Slots are released once jobs finish
+        assert await executor.run(lambda: 42) == 42
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_hashes_made_with_old_costs(client, users_db_session) -> None:
+    user = User(email="legacy@example.com", hashed_password=BcryptHasher(rounds=4).hash("pw"))
+    users_db_session.add(user)
+    await users_db_session.commit()
+
+    response = await client.post(
+        "/users/signed-token/login", data={"username": "legacy@example.com", "password": "pw"}
+    )
+    assert response.status_code == 200
+    await users_db_session.refresh(user)
+    assert user.hashed_password.startswith("$argon2id$")
@@ -0,0 +1,72 @@
+import logging
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import settings
+from core.database import get_app_db_engine, pool_statuses
+from core.pools import InstrumentedPool, instrument, pool_status
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_waits_and_timeouts(caplog) -> None:
+    engine = instrument(
+        create_async_engine(
+            settings.APP_DB_URL,
+            poolclass=InstrumentedPool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1,
+        ),
+        "test_db",
+        warn_wait_seconds=0.05,
+    )
+    try:
+        async with engine.connect():
+            status = pool_status(engine)
+            assert status["checked_out"] == 1
+            assert status["checkouts"] == 1
+
+            with (
+                caplog.at_level(logging.WARNING, logger="core.pools"),
+                pytest.raises(exc.TimeoutError),
+            ):
+                async with engine.connect():
+                    pass
+
+        status = pool_status(engine)
+        assert status["checked_out"] == 0
+        assert status["timeouts"] == 1
+        assert status["wait_seconds_max"] >= 0.1
+        assert sum(status["wait_histogram"].values()) == 2
+        assert "test_db" in caplog.text
+
+        # Stats survive engine.dispose(), which recreates the pool
+        await engine.dispose()
+        assert pool_status(engine)["timeouts"] == 1
+    finally:
+        await engine.dispose()
+
+
+def test_pool_statuses_uses_settings(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "APP_DB_POOL_SIZE", 3)
+    monkeypatch.setattr(settings, "USERS_DB_POOL_TIMEOUT", 2.5)
+    statuses = pool_statuses()
+    assert statuses["app_db"]["size"] == 3
+    assert statuses["app_db"]["pool_class"] == "InstrumentedPool"
+    assert statuses["users_db"]["timeout_seconds"] == 2.5
+
+
+@pytest.mark.asyncio
+async def test_pgbouncer_mode_disables_statement_cache(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "APP_DB_CONNECTION_MODE", "pgbouncer")
+    engine = get_app_db_engine()
+    try:
+        assert engine.pool._pre_ping is False
+        async with engine.connect() as conn:
+            raw = await conn.get_raw_connection()
+            assert raw.driver_connection._stmt_cache.get_max_size() == 0
+            assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.item import ItemRead
+from core.config import settings
+from core.database import AppDbSession
+from core.query_cache import QueryCache, invalidate_tags, statement_tags, tag_key
+from core.redis import get_redis
+from core.schemas.item import Item
+
+COUNT_ITEMS = select(func.count()).select_from(Item)
+
+
+@pytest.fixture(autouse=True)
+def query_cache_enabled(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "QUERY_CACHE_ENABLED", True)
+
+
+@pytest.fixture
+async def session(app_db_session):
+    # Entries from earlier runs share SQL text with this test's schema
+    await invalidate_tags("item")
+    async with AsyncSession(app_db_session.bind, sync_session_class=AppDbSession) as session:
+        yield session
+
+
+def test_statement_tags_cover_subqueries() -> None:
+    newest = select(func.max(Item.created_at)).scalar_subquery()
+    assert statement_tags(select(Item.id).where(Item.created_at == newest)) == {"item"}
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_until_a_commit_touches_the_table(session, app_db_session) -> None:
+    cache = QueryCache(ttl_seconds=30)
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [0]
+
+    # A plain session does not bump tags, so the cached count is served
+    async with AsyncSession(app_db_session.bind) as plain:
+        plain.add(Item(title="untracked"))
+        await plain.commit()
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [0]
+
+    session.add(Item(title="tracked"))
+    await session.flush()
+    # Uncommitted writes to a tagged table bypass the cache
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [2]
+    await session.commit()
+
+    items = await cache.fetch(session, select(Item).order_by(Item.title), list[ItemRead])
+    assert [item.title for item in items] == ["tracked", "untracked"]
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [2]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_miss_waits_for_the_lock_holder(session) -> None:
+    cache = QueryCache(ttl_seconds=30, lock_seconds=2)
+    redis = get_redis()
+    key = await cache.key(session, COUNT_ITEMS, list[int], {"item"})
+    await redis.set(f"{key}:lock", 1, px=2000)
+
+    async def load_elsewhere() -> None:
+        await asyncio.sleep(0.1)
+        await redis.set(key, b"[42]", ex=30)
+        await redis.delete(f"{key}:lock")
+
+    task = asyncio.create_task(load_elsewhere())
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [42]
+    await task
+
+
+@pytest.mark.asyncio
+async def test_lapsed_wait_leaves_the_other_callers_lock(session) -> None:
+    cache = QueryCache(ttl_seconds=30, lock_seconds=0.2)
+    redis = get_redis()
+    key = await cache.key(session, COUNT_ITEMS, list[int], {"item"})
+    await redis.set(f"{key}:lock", "elsewhere", px=2000)
+
+    # The wait gives up and loads without the lock, which it must not release
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [0]
+    assert await redis.get(f"{key}:lock") == b"elsewhere"
+    await redis.delete(f"{key}:lock")
+
+    # A caller that did take the lock releases it
+    await invalidate_tags("item")
+    key = await cache.key(session, COUNT_ITEMS, list[int], {"item"})
+    assert await cache.fetch(session, COUNT_ITEMS, list[int]) == [0]
+    assert await redis.get(key) == b"[0]"
+    assert not await redis.exists(f"{key}:lock")
+
+
+@pytest.mark.asyncio
+async def test_api_writes_bump_tags_only_when_enabled(client, monkeypatch) -> None:
+    redis = get_redis()
+    version = int(await redis.get(tag_key("item")) or 0)
+
+    monkeypatch.setattr(settings, "QUERY_CACHE_ENABLED", False)
+    assert (await client.post("/v1/items/", json={"title": "quiet"})).status_code == 201
+    assert int(await redis.get(tag_key("item")) or 0) == version
+
+    monkeypatch.setattr(settings, "QUERY_CACHE_ENABLED", True)
+    assert (await client.post("/v1/items/", json={"title": "tagged"})).status_code == 201
+    assert int(await redis.get(tag_key("item")) or 0) == version + 1
@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from starlette.responses import Response
+from starlette.types import Message, Receive, Scope, Send
+
+from core.query_stats import QueryStatsMiddleware, instrument_queries, redact_parameters
+from core.schemas.item import Item
+
+
+def test_redact_parameters() -> None:
+    assert redact_parameters({"title": "secret", "n": 1}) == {"title": "str", "n": "int"}
+    assert redact_parameters(("secret",)) == ["str"]
+    assert redact_parameters([{"a": 1}, {"a": 2}], executemany=True) == "<2 parameter sets>"
+
+
+@pytest.mark.asyncio
+async def test_server_timing_counts_request_queries(client, app_db_session) -> None:
+    instrument_queries(app_db_session.bind, slow_seconds=None)
+    response = await client.get("/v1/items/")
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+
+@pytest.mark.asyncio
+async def test_repeated_statements_and_slow_queries_are_logged(app_db_session, caplog) -> None:
+    instrument_queries(app_db_session.bind, slow_seconds=0.0)
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        for _ in range(3):
+            await app_db_session.execute(select(Item).where(Item.title == "secret"))
+        await Response(b"")(scope, receive, send)
+
+    messages: list[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    middleware = QueryStatsMiddleware(app, server_timing=True, n_plus_one_threshold=3)
+    scope = {"type": "http", "method": "GET", "path": "/loop", "headers": []}
+    with caplog.at_level(logging.WARNING, logger="core.query_stats"):
+        await middleware(scope, receive, send)
+
+    assert "Probable N+1: 3 identical statements in GET /loop" in caplog.text
+    assert "Slow query" in caplog.text
+    assert "secret" not in caplog.text
+    headers = dict(messages[0]["headers"])
+    assert headers[b"server-timing"].endswith(b'desc="3 queries"')
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_leave_no_timing_state(app_db_session, caplog) -> None:
+    instrument_queries(app_db_session.bind, slow_seconds=0.0)
+    for _ in range(3):
+        with pytest.raises(DBAPIError):
+            await app_db_session.execute(text("SELECT * FROM missing_table"))
+        await app_db_session.rollback()
+
+    connection = await app_db_session.connection()
+    with caplog.at_level(logging.WARNING, logger="core.query_stats"):
+        await connection.execute(text("SELECT 1"))
+    assert "Slow query" in caplog.text
+    assert not connection.info
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from core.config import settings
+from core.redis import close_redis, get_redis, get_text_redis, redis_status, redis_statuses
+
+
+@pytest.mark.asyncio
+async def test_pool_is_bounded_and_counts_waits(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "REDIS_MAX_CONNECTIONS", 1)
+    monkeypatch.setattr(settings, "REDIS_POOL_TIMEOUT", 0.1)
+    monkeypatch.setattr(settings, "REDIS_POOL_WAIT_WARNING_SECONDS", 0.05)
+    redis = get_redis()
+
+    # BLPOP holds the only connection until it times out
+    blocked = asyncio.create_task(redis.blpop(["test:redis:never"], timeout=1))
+    await asyncio.sleep(0.05)
+    assert redis_status(redis)["in_use"] == 1
+    with (
+        caplog.at_level(logging.WARNING, logger="core.pools"),
+        pytest.raises(ConnectionError),
+    ):
+        await redis.ping()
+    await blocked
+
+    status = redis_status(redis)
+    assert status["max_connections"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.1
+    assert status["command_stats"]["errors"] == 1
+    assert "redis" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_commands_and_pipelines_are_timed() -> None:
+    redis = get_text_redis()
+    await redis.set("test:redis:key", "value", ex=10)
+    assert await redis.get("test:redis:key") == "value"
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get("test:redis:key")
+        pipe.delete("test:redis:key")
+        assert await pipe.execute() == ["value", 1]
+
+    stats = redis_statuses()["redis_text"]["command_stats"]
+    assert stats["commands"] == 3
+    assert sum(stats["latency_histogram"].values()) == 3
+    # The bytes client has its own pool and stats
+    assert redis_statuses()["redis"]["command_stats"]["commands"] == 0
+
+
+@pytest.mark.asyncio
+async def test_close_redis_resets_clients() -> None:
+    redis = get_redis()
+    await redis.ping()
+    await close_redis()
+    assert get_redis() is not redis
+    assert await get_redis().ping()
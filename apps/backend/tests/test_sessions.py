@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from redis.exceptions import WatchError
+
+from app.auth.sessions import session_id
+from app.dependencies.auth import get_redis_strategy
+from core.redis import InstrumentedPipeline, get_text_redis
+from core.schemas.users import User
+
+
+async def _user_with_sessions(users_db_session, count: int) -> tuple[User, list[str]]:
+    user = User(email="sessions@example.com", hashed_password="x")
+    users_db_session.add(user)
+    await users_db_session.commit()
+    strategy = get_redis_strategy()
+    return user, [await strategy.write_token(user) for _ in range(count)]
+
+
+def _auth(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_prunes_stale_members(client, users_db_session) -> None:
+    user, tokens = await _user_with_sessions(users_db_session, 3)
+    strategy = get_redis_strategy()
+    redis = get_text_redis()
+    index = strategy.index_key(user.id)
+    # An expired member and one whose token key is gone
+    await redis.zadd(index, {"expired-token": time.time() - 1})
+    await redis.delete(f"{strategy.key_prefix}{tokens[2]}")
+
+    response = await client.get("/users/sessions", headers=_auth(tokens[0]))
+    assert response.status_code == 200
+    sessions = {s["id"]: s for s in response.json()}
+    assert set(sessions) == {session_id(tokens[0]), session_id(tokens[1])}
+    assert sessions[session_id(tokens[0])]["current"] is True
+    assert sessions[session_id(tokens[1])]["current"] is False
+    assert await redis.zcard(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_revoke_one_session(client, users_db_session) -> None:
+    _, tokens = await _user_with_sessions(users_db_session, 2)
+    url = f"/users/sessions/{session_id(tokens[1])}"
+
+    assert (await client.delete(url, headers=_auth(tokens[0]))).status_code == 204
+    assert (await client.get("/users/me", headers=_auth(tokens[1]))).status_code == 401
+    assert (await client.delete(url, headers=_auth(tokens[0]))).status_code == 404
+    assert (await client.get("/users/me", headers=_auth(tokens[0]))).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_log_out_everywhere(client, users_db_session) -> None:
+    user, tokens = await _user_with_sessions(users_db_session, 3)
+
+    response = await client.delete("/users/sessions", headers=_auth(tokens[0]))
+    assert response.status_code == 204
+    for token in tokens[1:]:
+        assert (await client.get("/users/me", headers=_auth(token))).status_code == 401
+    assert [s.token for s in await get_redis_strategy().list_sessions(user.id)] == [tokens[0]]
+
+    response = await client.delete(
+        "/users/sessions", params={"include_current": True}, headers=_auth(tokens[0])
+    )
+    assert response.status_code == 204
+    assert (await client.get("/users/sessions", headers=_auth(tokens[0]))).status_code == 401
+    assert not await get_text_redis().exists(get_redis_strategy().index_key(user.id))
+
+
+@pytest.mark.asyncio
+async def test_revoke_gives_up_under_contention(client, users_db_session, monkeypatch) -> None:
+    _, tokens = await _user_with_sessions(users_db_session, 2)
+
+    async def always_conflicts(self, raise_on_error: bool = True) -> list:
+        await self.reset()  # as the real execute does before re-raising
+        raise WatchError
+
+    monkeypatch.setattr(InstrumentedPipeline, "execute", always_conflicts)
+    response = await client.delete("/users/sessions", headers=_auth(tokens[0]))
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi_users.password import PasswordHelper
+
+from app.auth.signed_tokens import (
+    BloomFilter,
+    RefreshTokenStore,
+    RevocationFilter,
+    sign_token,
+    signing_key,
+    verify_token,
+)
+from core.config import settings
+from core.redis import get_text_redis
+from core.schemas.users import User
+
+KEY = b"k" * 32
+
+
+def test_verify_rejects_tampered_and_expired_tokens() -> None:
+    claims = {"sub": "user", "exp": time.time() + 60, "jti": "a"}
+    token = sign_token(claims, KEY)
+    assert verify_token(token, KEY) == claims
+
+    _, signature = token.split(".")
+    forged = sign_token(claims | {"sub": "admin"}, KEY).split(".")[0]
+    assert verify_token(f"{forged}.{signature}", KEY) is None
+    assert verify_token(token, b"x" * 32) is None
+    assert verify_token(token, KEY, now=claims["exp"]) is None
+    assert verify_token("opaque-session-token", KEY) is None
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for n in range(1000):
+        bloom.add(f"jti-{n}")
+    assert all(f"jti-{n}" in bloom for n in range(1000))
+    false_positives = sum(f"other-{n}" in bloom for n in range(10_000))
+    assert false_positives < 300
+
+
+async def _login(client, users_db_session) -> dict[str, str]:
+    users_db_session.add(
+        User(
+            email="signed@example.com",
+            hashed_password=PasswordHelper().hash("correct horse"),
+            is_superuser=True,
+        )
+    )
+    await users_db_session.commit()
+    response = await client.post(
+        "/users/signed-token/login",
+        data={"username": "signed@example.com", "password": "correct horse"},
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_login_refresh_and_logout(client, users_db_session) -> None:
+    pair = await _login(client, users_db_session)
+    headers = {"Authorization": f"Bearer {pair['access_token']}"}
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 200
+    assert (await client.get("/users/me", headers=headers)).json()["email"] == "signed@example.com"
+
+    refreshed = await client.post(
+        "/users/signed-token/refresh", json={"refresh_token": pair["refresh_token"]}
+    )
+    assert refreshed.status_code == 200
+    # Refresh tokens are single use
+    replay = await client.post(
+        "/users/signed-token/refresh", json={"refresh_token": pair["refresh_token"]}
+    )
+    assert replay.status_code == 401
+
+    logout = await client.post("/users/signed-token/logout", headers=headers)
+    assert logout.status_code == 204
+    assert (await client.get("/internal/pools", headers=headers)).status_code == 401
+
+    # Other processes learn about the revocation on their next sync
+    jti = verify_token(pair["access_token"], signing_key(settings.SECRET))["jti"]
+    elsewhere = RevocationFilter(get_text_redis)
+    assert not await elsewhere.is_revoked(jti)
+    await elsewhere.sync()
+    assert await elsewhere.is_revoked(jti)
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_the_paired_refresh_token(client, users_db_session) -> None:
+    pair = await _login(client, users_db_session)
+    headers = {"Authorization": f"Bearer {pair['access_token']}"}
+    other = await RefreshTokenStore(get_text_redis(), 60).issue(uuid.uuid4())
+
+    # Someone else's refresh token is refused and left intact
+    response = await client.post(
+        "/users/signed-token/logout", headers=headers, json={"refresh_token": other}
+    )
+    assert response.status_code == 403
+    assert (await client.get("/users/me", headers=headers)).status_code == 200
+
+    assert (await client.post("/users/signed-token/logout", headers=headers)).status_code == 204
+    refreshed = await client.post(
+        "/users/signed-token/refresh", json={"refresh_token": pair["refresh_token"]}
+    )
+    assert refreshed.status_code == 401
+    assert await RefreshTokenStore(get_text_redis(), 60).consume(other) is not None
+
+
+@pytest.mark.asyncio
+async def test_revocation_sync_survives_unexpected_errors(monkeypatch) -> None:
+    revocations = RevocationFilter(get_text_redis, sync_seconds=0.01)
+    calls = 0
+
+    async def flaky_sync() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ValueError("undecodable member")
+
+    monkeypatch.setattr(revocations, "sync", flaky_sync)
+    await revocations.start()
+    try:
+        await asyncio.sleep(0.1)
+        assert calls > 1
+    finally:
+        await revocations.stop()
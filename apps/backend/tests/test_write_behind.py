@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from core.database import AppDbSession
+from core.schemas.item import Item
+from core.write_behind import WriteBehindBuffer, flush_write_behind_buffers
+
+
+@pytest.fixture
+def session_maker(app_db_session) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        app_db_session.bind, sync_session_class=AppDbSession, expire_on_commit=False
+    )
+
+
+async def _count(session: AsyncSession) -> int:
+    return (await session.scalar(select(func.count()).select_from(Item))) or 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_inserts_share_one_batch(session_maker, app_db_session) -> None:
+    buffer = WriteBehindBuffer(Item, max_rows=3, max_delay_seconds=60, session_maker=session_maker)
+    items = await asyncio.gather(*(buffer.insert({"title": f"item {n}"}) for n in range(3)))
+
+    # The batch filled up, so it was written without waiting for the delay
+    assert [item.title for item in items] == ["item 0", "item 1", "item 2"]
+    assert all(item.id and item.created_at for item in items)
+    assert await _count(app_db_session) == 3
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_written_after_the_delay(session_maker, app_db_session) -> None:
+    buffer = WriteBehindBuffer(
+        Item, max_rows=100, max_delay_seconds=0.05, session_maker=session_maker
+    )
+    item = await asyncio.wait_for(buffer.insert({"title": "late"}), timeout=5)
+    assert item.title == "late"
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_rows(session_maker, app_db_session) -> None:
+    buffer = WriteBehindBuffer(
+        Item, max_rows=100, max_delay_seconds=60, session_maker=session_maker
+    )
+    pending = asyncio.create_task(buffer.insert({"title": "pending"}))
+    await asyncio.sleep(0)
+    assert len(buffer) == 1
+
+    await flush_write_behind_buffers()
+    assert (await pending).title == "pending"
+    assert await _count(app_db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_fails_every_caller(session_maker) -> None:
+    buffer = WriteBehindBuffer(Item, max_rows=2, max_delay_seconds=60, session_maker=session_maker)
+    results = await asyncio.gather(
+        buffer.insert({"title": "ok"}),
+        buffer.insert({"title": None}),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, Exception) for result in results)